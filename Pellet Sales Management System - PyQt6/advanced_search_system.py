@@ -34,28 +34,51 @@ Business Value:
 
 import sys
 import os
+import re
 import logging
-from typing import Dict, List, Tuple, Optional, Union, Any
+import time
+from collections import OrderedDict
+from array import array
+from typing import Dict, List, Tuple, Optional, Union, Any, Iterable, Iterator, FrozenSet
+from itertools import chain, islice
 from datetime import date, datetime
 from decimal import Decimal
+from functools import lru_cache
+from dataclasses import dataclass
+from operator import itemgetter
 
+import numpy as np
 import pandas as pd
 from PyQt6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QHBoxLayout, QLabel, QDateEdit, 
-    QTableWidget, QPushButton, QLineEdit, QTableWidgetItem, QFileDialog, 
-    QCheckBox, QMessageBox, QHeaderView, QAbstractItemView, QWidget,
+    QTableView, QPushButton, QLineEdit, QFileDialog, 
+    QCheckBox, QMessageBox, QHeaderView, QAbstractItemView, QListView,
     QSplitter, QFrame, QProgressBar, QStatusBar, QToolTip
 )
-from PyQt6.QtCore import QDate, Qt, QLocale, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import (
+    QDate, Qt, QLocale, QThread, QObject, QRunnable, QThreadPool, pyqtSignal, QTimer,
+    QAbstractTableModel, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+)
 from PyQt6.QtGui import QGuiApplication, QIcon, QFont, QCursor
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, NamedStyle
 from openpyxl.utils import get_column_letter
 from openpyxl.formatting.rule import ColorScaleRule
 
+try:
+    import xlsxwriter
+except ImportError:  # Optional faster export backend; openpyxl is used otherwise
+    xlsxwriter = None
+
 import mysql.connector
-from conexión import conectar
+from connection_pool import ConnectionPool, shared_pool
+
+try:
+    from mysql.connector.connection_cext import CMySQLConnection
+except ImportError:  # C extension not available; rows are decoded in Python
+    CMySQLConnection = None
 
 # Configure logging for enterprise monitoring
 logging.basicConfig(
@@ -65,6 +88,196 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+BASE_SEARCH_QUERY = """
+            SELECT VentaID, Articulo, PuntoVenta, Fecha, TipoDocumento, 
+                   NumeroDocumento, Unidad, KilosTotales, ValorUnitario, 
+                   Descuento, Neto, IVA, Total, NetoPorKG, Pago, 
+                   NumeroComprobante, MedioPago
+            FROM VentasDiarias
+        """
+
+# Result columns in SELECT order; rows travel as tuples in this order
+RESULT_COLUMNS = (
+    "VentaID", "Articulo", "PuntoVenta", "Fecha", "TipoDocumento",
+    "NumeroDocumento", "Unidad", "KilosTotales", "ValorUnitario", "Descuento",
+    "Neto", "IVA", "Total", "NetoPorKG", "Pago", "NumeroComprobante", "MedioPago"
+)
+
+_FLOAT_RESULT_COLUMNS = (
+    "KilosTotales", "ValorUnitario", "Descuento", "Neto", "IVA", "Total", "NetoPorKG"
+)
+
+# SQL keywords and comment/statement tokens rejected in free-text filters,
+# matched in a single scan
+_DANGEROUS_RE = re.compile(
+    r"\b(?:DROP|DELETE|UPDATE|INSERT|EXEC(?:UTE)?|SCRIPT|UNION|SELECT)\b|--|/\*|\*/|;",
+    re.IGNORECASE
+)
+
+# Whole-value patterns for typed inputs; a value matching one of these
+# cannot carry SQL, so the keyword scan is skipped for it
+_INPUT_PATTERNS = {
+    "number": re.compile(r"[+-]?\d+"),
+}
+
+# IN-list placeholder strings indexed by value count, built once at import
+_PLACEHOLDERS = tuple(", ".join(["%s"] * count) for count in range(257))
+
+
+def _placeholders(count: int) -> str:
+    """Placeholder list for an IN clause with ``count`` values"""
+    if count < len(_PLACEHOLDERS):
+        return _PLACEHOLDERS[count]
+    return ", ".join(["%s"] * count)
+
+
+@lru_cache(maxsize=64)
+def _sql_for_shape(shape: Tuple[bool, bool, int, int, int, bool, bool, bool]) -> str:
+    """
+    Assemble the search SQL for a filter shape
+    
+    The SQL text only depends on which clauses are active and how many
+    values each IN-list holds, so it is built once per shape and reused
+    for every search with different values.
+    
+    Args:
+        shape (Tuple): (has_date_range, single_day, branch_count,
+                        type_count, product_count, has_document_number,
+                        has_keyset, has_limit)
+        
+    Returns:
+        str: Parameterized SQL query
+    """
+    (has_dates, single_day, branch_count, type_count, product_count, has_doc,
+     has_keyset, has_limit) = shape
+    conditions = []
+    
+    if has_dates:
+        conditions.append("Fecha = %s" if single_day else "Fecha BETWEEN %s AND %s")
+    if branch_count:
+        conditions.append(f"PuntoVenta IN ({_placeholders(branch_count)})")
+    if type_count:
+        conditions.append(f"TipoDocumento IN ({_placeholders(type_count)})")
+    if product_count:
+        conditions.append(f"Articulo IN ({_placeholders(product_count)})")
+    if has_doc:
+        conditions.append("NumeroDocumento = %s")
+    if has_keyset:
+        # Rows after the last (Fecha, VentaID) already seen; spelled out
+        # so MySQL can range-scan idx_ventasdiarias_fecha_ventaid
+        conditions.append("(Fecha < %s OR (Fecha = %s AND VentaID < %s))")
+    
+    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    query = f"{BASE_SEARCH_QUERY} WHERE {where_clause} ORDER BY Fecha DESC, VentaID DESC"
+    if has_limit:
+        query += " LIMIT %s"
+    return query
+
+
+# Connections are shared with the rest of the application
+_connection_pool = shared_pool
+
+# Reference lists (branches, document types, products) barely change, so
+# they are shared across dialog sessions for _REF_TTL seconds
+_REF_TTL = 600
+_REF_CACHE: Dict[str, Tuple[float, List[str]]] = {}
+
+
+def _cached_reference(key: str, sql: str, pool: ConnectionPool) -> List[str]:
+    """Return the first column of ``sql``, cached under ``key`` for _REF_TTL seconds"""
+    now = time.monotonic()
+    hit = _REF_CACHE.get(key)
+    if hit is not None and now - hit[0] < _REF_TTL:
+        return list(hit[1])
+    
+    with pool.connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(sql)
+        values = [row[0] for row in cursor.fetchall()]
+        cursor.close()
+    
+    _REF_CACHE[key] = (now, values)
+    return list(values)
+
+
+def _invalidate_reference_cache():
+    """Forget cached reference lists so the next lookup hits the database"""
+    _REF_CACHE.clear()
+
+
+# Shared formatter locale; CLP amounts repeat heavily across result rows
+_CLP_LOCALE = QLocale(QLocale.Language.Spanish, QLocale.Country.Chile)
+
+
+@lru_cache(maxsize=16384)
+def _currency_text(amount: float) -> str:
+    """Locale-formatted peso string for an already rounded amount"""
+    return _CLP_LOCALE.toCurrencyString(amount, "$")
+
+
+def _format_currency(value: Any) -> str:
+    """Format currency values using Chilean locale"""
+    try:
+        if value is None or value == '':
+            return '$0'
+        
+        numeric_value = float(value) if isinstance(value, (int, float, str, Decimal)) else 0
+        return _currency_text(round(numeric_value, 2))
+        
+    except (ValueError, TypeError):
+        return '$0'
+
+
+def _results_frame(rows: Iterable[Tuple]) -> pd.DataFrame:
+    """
+    Build the columnar result set shared by the results table and the export
+    
+    Args:
+        rows (Iterable[Tuple]): Rows in RESULT_COLUMNS order
+        
+    Returns:
+        pd.DataFrame: Results with date and numeric columns typed
+    """
+    frame = pd.DataFrame.from_records(rows, columns=RESULT_COLUMNS)
+    frame["Fecha"] = pd.to_datetime(frame["Fecha"])
+    for column in _FLOAT_RESULT_COLUMNS:
+        frame[column] = pd.to_numeric(frame[column], errors="coerce").fillna(0.0).astype("float64")
+    frame["Unidad"] = pd.to_numeric(frame["Unidad"], errors="coerce").fillna(0).astype("int32")
+    return frame
+
+
+def _results_frame_from_chunks(chunks: Iterable[List[Tuple]]) -> pd.DataFrame:
+    """
+    Build the results DataFrame batch by batch
+    
+    Each batch of row tuples is converted and released before the next one
+    is fetched, so the full result set never exists as Python tuples.
+    """
+    frames = [_results_frame(rows) for rows in chunks]
+    if not frames:
+        return _results_frame(())
+    if len(frames) == 1:
+        return frames[0]
+    return pd.concat(frames, ignore_index=True)
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """
+    Validated search criteria
+    
+    Built once per search by the dialog after validation; being frozen and
+    hashable it also identifies the results it produced.
+    """
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    # None means every value is selected, so no IN clause is emitted
+    branches: Optional[FrozenSet[str]] = None
+    document_types: Optional[FrozenSet[str]] = None
+    products: Optional[FrozenSet[str]] = None
+    document_number: str = ""
+
+
 class DatabaseQueryBuilder:
     """
     Enterprise SQL Query Builder with Security Focus
@@ -77,89 +290,136 @@ class DatabaseQueryBuilder:
     """
     
     def __init__(self):
-        self.base_query = """
-            SELECT VentaID, Articulo, PuntoVenta, Fecha, TipoDocumento, 
-                   NumeroDocumento, Unidad, KilosTotales, ValorUnitario, 
-                   Descuento, Neto, IVA, Total, NetoPorKG, Pago, 
-                   NumeroComprobante, MedioPago
-            FROM VentasDiarias
-        """
-        self.query_cache = {}
+        self.base_query = BASE_SEARCH_QUERY
         logger.info("DatabaseQueryBuilder initialized")
     
-    def build_search_query(self, filters: Dict[str, Any]) -> Tuple[str, Tuple]:
+    def build_search_query(self, filters: SearchFilters, limit: Optional[int] = None,
+                           after: Optional[Tuple[date, int]] = None) -> Tuple[str, Tuple, Tuple]:
         """
         Build parameterized search query with multiple filters
         
+        Results are ordered by (Fecha, VentaID) descending. Passing ``limit``
+        returns one page; passing the (Fecha, VentaID) of the last row seen
+        as ``after`` continues from there (keyset pagination, no OFFSET).
+        
         Args:
-            filters (Dict): Search criteria including dates, branches, types, etc.
+            filters (SearchFilters): Validated search criteria
+            limit (Optional[int]): Maximum number of rows to return
+            after (Optional[Tuple[date, int]]): Keyset of the previous page's last row
             
         Returns:
-            Tuple[str, Tuple]: SQL query and parameters tuple
+            Tuple[str, Tuple, Tuple]: SQL query, parameters tuple and the
+            filter shape the SQL was built for (see _sql_for_shape)
         """
-        try:
-            conditions = []
-            parameters = []
+        parameters = []
+        
+        # Date range filtering (always required)
+        start_date = filters.start_date
+        end_date = filters.end_date
+        has_dates = bool(start_date and end_date)
+        single_day = has_dates and start_date == end_date
+        
+        if has_dates:
+            if single_day:
+                parameters.append(start_date)
+            else:
+                parameters.extend([start_date, end_date])
+        
+        # Branch filtering
+        branches = filters.branches or frozenset()
+        parameters.extend(branches)
+        
+        # Document type filtering
+        doc_types = filters.document_types or frozenset()
+        if "Todo" in doc_types:
+            doc_types = frozenset()
+        parameters.extend(doc_types)
+        
+        # Product filtering
+        products = filters.products or frozenset()
+        if "Todo" in products:
+            products = frozenset()
+        parameters.extend(products)
+        
+        # Document number filtering (exact match)
+        doc_number = filters.document_number
+        if doc_number:
+            parameters.append(doc_number)
+        
+        # Pagination
+        if after is not None:
+            last_date, last_id = after
+            parameters.extend([last_date, last_date, last_id])
+        if limit is not None:
+            parameters.append(int(limit))
+        
+        # Reuse the SQL text assembled for this filter shape
+        shape = (has_dates, single_day, len(branches), len(doc_types),
+                 len(products), bool(doc_number), after is not None, limit is not None)
+        final_query = _sql_for_shape(shape)
+        
+        logger.info("Built search query for shape %s with %d parameters", 
+                   shape, len(parameters))
+        
+        return final_query, tuple(parameters), shape
+    
+    def iter_results(self, conn, filters: SearchFilters, chunk: int = 5000,
+                     pool: Optional[ConnectionPool] = None) -> Iterator[Tuple]:
+        """
+        Stream search results from an unbuffered cursor
+        
+        Rows are pulled from the server ``chunk`` at a time, so memory stays
+        bounded regardless of how many records match the filters.
+        
+        Args:
+            conn: Open MySQL connection
+            filters (SearchFilters): Search criteria passed to build_search_query
+            chunk (int): Number of rows fetched per round-trip
+            pool (Optional[ConnectionPool]): Pool ``conn`` came from; see iter_result_chunks
             
-            # Date range filtering (always required)
-            start_date = filters.get('start_date')
-            end_date = filters.get('end_date')
+        Yields:
+            Tuple: One result row at a time, in RESULT_COLUMNS order
+        """
+        for rows in self.iter_result_chunks(conn, filters, chunk, pool):
+            yield from rows
+    
+    def iter_result_chunks(self, conn, filters: SearchFilters, chunk: int = 10000,
+                           pool: Optional[ConnectionPool] = None) -> Iterator[List[Tuple]]:
+        """
+        Stream search results as lists of up to ``chunk`` row tuples
+        
+        When ``pool`` is given, the query runs on a server-side prepared
+        statement kept per connection and filter shape, so searches that
+        only change filter values reuse the server's plan.
+        
+        Args:
+            conn: Open MySQL connection
+            filters (SearchFilters): Search criteria passed to build_search_query
+            chunk (int): Number of rows fetched per round-trip
+            pool (Optional[ConnectionPool]): Pool ``conn`` came from
             
-            if start_date and end_date:
-                if start_date == end_date:
-                    conditions.append("Fecha = %s")
-                    parameters.append(start_date)
+        Yields:
+            List[Tuple]: Consecutive batches of rows, in RESULT_COLUMNS order
+        """
+        query, parameters, shape = self.build_search_query(filters)
+        prepared = pool is not None
+        cursor = pool.prepared_cursor(conn, shape) if prepared else conn.cursor(buffered=False)
+        try:
+            cursor.execute(query, parameters)
+            while True:
+                rows = cursor.fetchmany(chunk)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            # Drain rows left behind if the consumer stopped early
+            if conn.unread_result:
+                if prepared:
+                    cursor.fetchall()
                 else:
-                    conditions.append("Fecha BETWEEN %s AND %s")
-                    parameters.extend([start_date, end_date])
-            
-            # Branch filtering
-            branches = filters.get('branches', [])
-            if branches and len(branches) > 0:
-                placeholders = ', '.join(['%s'] * len(branches))
-                conditions.append(f"PuntoVenta IN ({placeholders})")
-                parameters.extend(branches)
-            
-            # Document type filtering
-            doc_types = filters.get('document_types', [])
-            if doc_types and len(doc_types) > 0 and "Todo" not in doc_types:
-                placeholders = ', '.join(['%s'] * len(doc_types))
-                conditions.append(f"TipoDocumento IN ({placeholders})")
-                parameters.extend(doc_types)
-            
-            # Product filtering
-            products = filters.get('products', [])
-            if products and len(products) > 0 and "Todo" not in products:
-                placeholders = ', '.join(['%s'] * len(products))
-                conditions.append(f"Articulo IN ({placeholders})")
-                parameters.extend(products)
-            
-            # Document number filtering (exact match)
-            doc_number = filters.get('document_number', '').strip()
-            if doc_number:
-                conditions.append("NumeroDocumento = %s")
-                parameters.append(doc_number)
-            
-            # Construct final query
-            where_clause = " AND ".join(conditions) if conditions else "1=1"
-            final_query = f"{self.base_query} WHERE {where_clause} ORDER BY Fecha DESC, VentaID DESC"
-            
-            # Cache query for performance monitoring
-            query_key = hash(final_query + str(tuple(parameters)))
-            self.query_cache[query_key] = {
-                'query': final_query,
-                'parameters': parameters,
-                'timestamp': datetime.now()
-            }
-            
-            logger.info("Built search query with %d conditions and %d parameters", 
-                       len(conditions), len(parameters))
-            
-            return final_query, tuple(parameters)
-            
-        except Exception as e:
-            logger.error("Error building search query: %s", e)
-            return self.base_query + " WHERE 1=0", ()  # Safe fallback
+                    conn.consume_results()
+            if not prepared:
+                cursor.close()
     
     def validate_input(self, value: str, input_type: str = "text") -> bool:
         """
@@ -176,26 +436,17 @@ class DatabaseQueryBuilder:
             if not value or not isinstance(value, str):
                 return True  # Empty values are allowed for optional filters
             
-            # Basic SQL injection prevention
-            dangerous_keywords = [
-                'DROP', 'DELETE', 'UPDATE', 'INSERT', 'EXEC', 'EXECUTE',
-                'SCRIPT', 'UNION', 'SELECT', '--', '/*', '*/', ';'
-            ]
+            pattern = _INPUT_PATTERNS.get(input_type)
+            if pattern is not None:
+                return pattern.fullmatch(value) is not None
             
-            upper_value = value.upper()
-            for keyword in dangerous_keywords:
-                if keyword in upper_value:
-                    logger.warning("Potentially dangerous input detected: %s", value)
-                    return False
+            # Basic SQL injection prevention
+            if _DANGEROUS_RE.search(value):
+                logger.warning("Potentially dangerous input detected: %s", value)
+                return False
             
             # Type-specific validation
-            if input_type == "number":
-                try:
-                    int(value)
-                    return True
-                except ValueError:
-                    return False
-            elif input_type == "date":
+            if input_type == "date":
                 try:
                     datetime.strptime(value, '%Y-%m-%d')
                     return True
@@ -220,9 +471,33 @@ class ExcelExportEngine:
     - Multi-language support and currency formatting
     """
     
+    _HEADERS = (
+        "Venta ID", "Artículo", "Punto de Venta", "Fecha", "Tipo Documento",
+        "N° Documento", "Unidad", "Kilos", "Valor/U", "Descuento", 
+        "Neto", "IVA", "Total", "Neto/KG", "Pago", "N° Comprobante", "Medio Pago"
+    )
+    
+    # Record keys aligned 1:1 with _HEADERS
+    _DATA_KEYS = RESULT_COLUMNS
+    
+    # Zero-based column positions that receive special number formats
+    _CURRENCY_COLS = frozenset({8, 9, 10, 11, 12, 13})
+    _DATE_COL = 3
+    
+    # Zero-based positions of the columns summarized below the table,
+    # read from each row tuple in one C-level call
+    _UNITS_COL = 6
+    _TOTAL_COL = 12
+    _SUMMARY_VALUES = itemgetter(_TOTAL_COL, _UNITS_COL)
+    
+    # Rows buffered ahead of the stream to size columns
+    _WIDTH_SAMPLE_ROWS = 5000
+    
     def __init__(self):
         self.corporate_styles = self._initialize_corporate_styles()
-        logger.info("ExcelExportEngine initialized with corporate styling")
+        self._backend = "xlsxwriter" if xlsxwriter is not None else "openpyxl"
+        logger.info("ExcelExportEngine initialized with corporate styling (%s backend)",
+                    self._backend)
     
     def _initialize_corporate_styles(self) -> Dict[str, Any]:
         """Initialize corporate styling templates"""
@@ -238,17 +513,30 @@ class ExcelExportEngine:
                 right=Side(style='thin'),
                 top=Side(style='thin'),
                 bottom=Side(style='thin')
+            ),
+            # Color scale for the Total column
+            'total_color_scale': ColorScaleRule(
+                start_type='min', start_color='FFFF0000',  # Red for low values
+                mid_type='percentile', mid_value=50, mid_color='FFFFFF00',  # Yellow for medium
+                end_type='max', end_color='FF00FF00'  # Green for high values
             )
         }
     
-    def export_search_results(self, data: List[Dict[str, Any]], 
+    def export_search_results(self, data: Union[pd.DataFrame, Iterable[Tuple]], 
                             filename: str, 
                             metadata: Dict[str, str]) -> bool:
         """
         Export search results to professionally formatted Excel file
         
+        Uses XlsxWriter in constant-memory mode when it is installed and
+        falls back to openpyxl's write-only mode otherwise; both stream rows
+        straight into the XLSX archive instead of materializing a Cell
+        object per value. ``data`` is either the results DataFrame or any
+        iterable of row tuples in RESULT_COLUMNS order (e.g. the generator
+        returned by DatabaseQueryBuilder.iter_results), consumed once.
+        
         Args:
-            data (List[Dict]): Search results data
+            data (Union[pd.DataFrame, Iterable[Tuple]]): Search results data
             filename (str): Output filename
             metadata (Dict): Export metadata (date range, filters, etc.)
             
@@ -256,178 +544,375 @@ class ExcelExportEngine:
             bool: True if export successful
         """
         try:
-            if not data:
+            if isinstance(data, pd.DataFrame):
+                data = data.loc[:, list(self._DATA_KEYS)].itertuples(index=False, name=None)
+            
+            rows = iter(data)
+            first = next(rows, None)
+            if first is None:
                 logger.warning("No data to export")
                 return False
             
-            # Create workbook and worksheet
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "Sales Search Results"
+            if self._backend == "xlsxwriter":
+                # XlsxWriter accepts column widths after the rows, so they
+                # are tracked while writing
+                record_count = self._export_with_xlsxwriter(chain((first,), rows),
+                                                            filename, metadata)
+                logger.info("Successfully exported %d records to %s", record_count, filename)
+                return True
+            
+            # openpyxl's write-only mode emits column widths before the first
+            # row, so size them from a bounded head of the stream
+            head = [first]
+            head.extend(islice(rows, self._WIDTH_SAMPLE_ROWS - 1))
+            widths = self._column_widths(head)
+            records = chain(head, rows)
+            
+            # Create streaming workbook and worksheet
+            wb = Workbook(write_only=True)
+            ws = wb.create_sheet("Sales Search Results")
+            self._optimize_column_widths(ws, widths)
             
             # Add metadata header
-            self._add_metadata_section(ws, metadata)
-            
-            # Add data table
-            self._add_data_table(ws, data)
+            header_row = self._add_metadata_section(ws, metadata)
             
-            # Apply conditional formatting
-            self._apply_conditional_formatting(ws, len(data))
-            
-            # Optimize column widths
-            self._optimize_column_widths(ws)
+            # Add data table, collecting the summary columns in the same pass
+            sales, units = self._add_data_table(ws, records, header_row)
             
             # Add summary statistics
-            self._add_summary_statistics(ws, data)
+            self._add_summary_statistics(ws, sales, units)
             
             # Save workbook
             wb.save(filename)
             
-            logger.info("Successfully exported %d records to %s", len(data), filename)
+            logger.info("Successfully exported %d records to %s", len(sales), filename)
             return True
             
         except Exception as e:
             logger.error("Error exporting to Excel: %s", e)
             return False
     
-    def _add_metadata_section(self, ws, metadata: Dict[str, str]):
-        """Add metadata header to worksheet"""
+    def _export_with_xlsxwriter(self, data: Iterable[Tuple],
+                                filename: str, metadata: Dict[str, str]) -> int:
+        """Write the report with XlsxWriter, mirroring the openpyxl layout"""
+        wb = xlsxwriter.Workbook(filename, {'constant_memory': True})
+        try:
+            ws = wb.add_worksheet("Sales Search Results")
+            
+            # Translate corporate styles into reusable Format objects
+            base = {'font_color': '#000000', 'font_size': 10,
+                    'border': 1, 'align': 'center'}
+            header_format = wb.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'font_size': 12,
+                'bg_color': '#0f3460', 'border': 1, 'align': 'center'
+            })
+            row_formats = []
+            for alt in (False, True):
+                fill = {'bg_color': '#F0F0F0'} if alt else {}
+                plain = wb.add_format({**base, **fill})
+                currency = wb.add_format({**base, **fill, 'num_format': '#,##0 "CLP"'})
+                date_fmt = wb.add_format({**base, **fill, 'num_format': 'DD-MM-YYYY'})
+                row_formats.append(tuple(
+                    currency if col_idx in self._CURRENCY_COLS
+                    else date_fmt if col_idx == self._DATE_COL
+                    else plain
+                    for col_idx in range(len(self._DATA_KEYS))
+                ))
+            bold = wb.add_format({'bold': True})
+            
+            # Title and metadata (rows are zero-based in XlsxWriter)
+            ws.merge_range(0, 0, 0, len(self._HEADERS) - 1, "Sales Search Results Report", wb.add_format({
+                'bold': True, 'font_size': 16, 'font_color': '#FFFFFF',
+                'bg_color': '#0f3460', 'align': 'center'
+            }))
+            row = 1
+            for key, value in metadata.items():
+                ws.merge_range(row, 0, row, 3, f"{key}: {value}", bold)
+                row += 1
+            header_row = row + 1
+            
+            # Data table
+            ws.write_row(header_row, 0, self._HEADERS, header_format)
+            sales = array('d')
+            units = array('d')
+            summary_values = self._SUMMARY_VALUES
+            cell_value = self._cell_value
+            lengths = [len(header) for header in self._HEADERS]
+            for row_idx, record in enumerate(data, header_row + 1):
+                # Alternate fill on even sheet rows, as in the openpyxl layout
+                formats = row_formats[row_idx % 2]
+                for col_idx, value in enumerate(record):
+                    value = cell_value(value)
+                    ws.write(row_idx, col_idx, value, formats[col_idx])
+                    length = len(str(value))
+                    if length > lengths[col_idx]:
+                        lengths[col_idx] = length
+                total, unit = summary_values(record)
+                sales.append(total or 0)
+                units.append(unit or 0)
+            
+            for col_idx, length in enumerate(lengths):
+                ws.set_column(col_idx, col_idx, self._clamp_width(length))
+            
+            record_count = len(sales)
+            last_row = header_row + record_count
+            if record_count:
+                ws.conditional_format(header_row + 1, self._TOTAL_COL,
+                                      last_row, self._TOTAL_COL, {
+                    'type': '3_color_scale',
+                    'min_color': '#FF0000', 'mid_color': '#FFFF00', 'max_color': '#00FF00'
+                })
+            
+            # Summary statistics
+            summary = self._summary_data(sales, units)
+            for offset, (label, value) in enumerate(summary, last_row + 2):
+                ws.write(offset, 0, label, bold)
+                ws.write(offset, 1, value)
+            
+            return record_count
+        finally:
+            wb.close()
+    
+    def _styled_cell(self, ws, value: Any, font: Font = None, fill: PatternFill = None,
+                     alignment: Alignment = None, border: Border = None,
+                     number_format: str = None) -> WriteOnlyCell:
+        """Create a write-only cell carrying the given styles"""
+        cell = WriteOnlyCell(ws, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        if border is not None:
+            cell.border = border
+        if number_format is not None:
+            cell.number_format = number_format
+        return cell
+    
+    def _add_metadata_section(self, ws, metadata: Dict[str, str]) -> int:
+        """Add metadata header to worksheet, returning the table header row"""
         # Title
-        ws.merge_cells('A1:Q1')
-        title_cell = ws['A1']
-        title_cell.value = "Sales Search Results Report"
-        title_cell.font = Font(bold=True, size=16, color="FFFFFF")
-        title_cell.fill = PatternFill(start_color="0f3460", end_color="0f3460", fill_type="solid")
-        title_cell.alignment = Alignment(horizontal='center')
+        ws.append([self._styled_cell(
+            ws, "Sales Search Results Report",
+            font=Font(bold=True, size=16, color="FFFFFF"),
+            fill=PatternFill(start_color="0f3460", end_color="0f3460", fill_type="solid"),
+            alignment=Alignment(horizontal='center')
+        )])
+        ws.merged_cells.add(f'A1:{get_column_letter(len(self._HEADERS))}1')
         
         # Metadata rows
         row = 2
+        metadata_font = Font(bold=True)
         for key, value in metadata.items():
-            ws.merge_cells(f'A{row}:D{row}')
-            cell = ws[f'A{row}']
-            cell.value = f"{key}: {value}"
-            cell.font = Font(bold=True)
+            ws.append([self._styled_cell(ws, f"{key}: {value}", font=metadata_font)])
+            ws.merged_cells.add(f'A{row}:D{row}')
             row += 1
         
         # Add separator row
+        ws.append([])
         row += 1
         return row
     
-    def _add_data_table(self, ws, data: List[Dict[str, Any]]):
-        """Add main data table with headers"""
-        start_row = 6  # After metadata section
+    def _add_data_table(self, ws, data: Iterable[Tuple],
+                        header_row: int) -> Tuple[array, array]:
+        """
+        Add main data table with headers
+        
+        Returns:
+            Tuple[array, array]: Per-row Total and Unidad values for the summary
+        """
+        styles = self.corporate_styles
+        center = Alignment(horizontal='center')
         
         # Headers
-        headers = [
-            "Venta ID", "Artículo", "Punto de Venta", "Fecha", "Tipo Documento",
-            "N° Documento", "Unidad", "Kilos", "Valor/U", "Descuento", 
-            "Neto", "IVA", "Total", "Neto/KG", "Pago", "N° Comprobante", "Medio Pago"
-        ]
+        ws.append([
+            self._styled_cell(ws, header, font=styles['header_font'],
+                              fill=styles['header_fill'], alignment=center,
+                              border=styles['border_style'])
+            for header in self._HEADERS
+        ])
+        
+        # Data rows (sheet row numbers continue after the header row)
+        row_styles = self._register_data_styles(ws.parent)
+        summary_values = self._SUMMARY_VALUES
+        cell_value = self._cell_value
+        sales = array('d')
+        units = array('d')
+        for row_idx, record in enumerate(data, header_row + 1):
+            # Alternate fill on even sheet rows
+            style_names = row_styles[row_idx % 2 == 0]
+            row_cells = []
+            for col_idx, value in enumerate(record):
+                cell = WriteOnlyCell(ws, value=cell_value(value))
+                cell.style = style_names[col_idx]
+                row_cells.append(cell)
+            ws.append(row_cells)
+            
+            total, unit = summary_values(record)
+            sales.append(total or 0)
+            units.append(unit or 0)
+        
+        # Conditional formatting over the Total column now that the last
+        # data row is known
+        if sales:
+            try:
+                total_col = get_column_letter(self._TOTAL_COL + 1)
+                total_range = f"{total_col}{header_row + 1}:{total_col}{header_row + len(sales)}"
+                ws.conditional_formatting.add(total_range, styles['total_color_scale'])
+            except Exception as e:
+                logger.warning("Could not apply conditional formatting: %s", e)
+        
+        return sales, units
+    
+    def _register_data_styles(self, wb) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """
+        Register the data-cell named styles on a workbook
         
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=start_row, column=col_num, value=header)
-            cell.font = self.corporate_styles['header_font']
-            cell.fill = self.corporate_styles['header_fill']
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = self.corporate_styles['border_style']
-        
-        # Data rows
-        for row_idx, record in enumerate(data, start_row + 1):
-            for col_idx, header in enumerate(headers, 1):
-                # Map display headers to data keys
-                data_key = self._map_header_to_key(header)
-                cell_value = record.get(data_key, "")
-                
-                cell = ws.cell(row=row_idx, column=col_idx, value=cell_value)
-                cell.font = self.corporate_styles['data_font']
-                cell.border = self.corporate_styles['border_style']
-                
-                # Apply alternating row colors
-                if row_idx % 2 == 0:
-                    cell.fill = self.corporate_styles['data_fill_alt']
-                
-                # Format currency columns
-                if header in ["Valor/U", "Descuento", "Neto", "IVA", "Total", "Neto/KG"]:
-                    cell.number_format = self.corporate_styles['currency_format']
-                elif header == "Fecha":
-                    cell.number_format = self.corporate_styles['date_format']
-                
-                cell.alignment = Alignment(horizontal='center')
-    
-    def _map_header_to_key(self, header: str) -> str:
-        """Map display header to data dictionary key"""
-        header_map = {
-            "Venta ID": "VentaID",
-            "Artículo": "Articulo", 
-            "Punto de Venta": "PuntoVenta",
-            "Fecha": "Fecha",
-            "Tipo Documento": "TipoDocumento",
-            "N° Documento": "NumeroDocumento",
-            "Unidad": "Unidad",
-            "Kilos": "KilosTotales",
-            "Valor/U": "ValorUnitario",
-            "Descuento": "Descuento",
-            "Neto": "Neto",
-            "IVA": "IVA", 
-            "Total": "Total",
-            "Neto/KG": "NetoPorKG",
-            "Pago": "Pago",
-            "N° Comprobante": "NumeroComprobante",
-            "Medio Pago": "MedioPago"
-        }
-        return header_map.get(header, header)
+        Returns:
+            Tuple: Style name per column for plain rows and for alternate rows
+        """
+        styles = self.corporate_styles
+        center = Alignment(horizontal='center')
+        row_styles = []
+        for alt in (False, True):
+            suffix = "_alt" if alt else ""
+            fill = styles['data_fill_alt'] if alt else PatternFill()
+            for name, number_format in (("sales_data", "General"),
+                                        ("sales_currency", styles['currency_format']),
+                                        ("sales_date", styles['date_format'])):
+                wb.add_named_style(NamedStyle(
+                    name=name + suffix, font=styles['data_font'], fill=fill,
+                    border=styles['border_style'], alignment=center,
+                    number_format=number_format
+                ))
+            row_styles.append(tuple(
+                "sales_currency" + suffix if col_idx in self._CURRENCY_COLS
+                else "sales_date" + suffix if col_idx == self._DATE_COL
+                else "sales_data" + suffix
+                for col_idx in range(len(self._DATA_KEYS))
+            ))
+        return row_styles[0], row_styles[1]
     
-    def _apply_conditional_formatting(self, ws, data_rows: int):
-        """Apply conditional formatting for better visual analysis"""
-        try:
-            # Color scale for Total column (assuming column M)
-            total_column = f"M7:M{6 + data_rows}"
-            color_scale = ColorScaleRule(
-                start_type='min', start_color='FFFF0000',  # Red for low values
-                mid_type='percentile', mid_value=50, mid_color='FFFFFF00',  # Yellow for medium
-                end_type='max', end_color='FF00FF00'  # Green for high values
-            )
-            ws.conditional_formatting.add(total_column, color_scale)
-            
-        except Exception as e:
-            logger.warning("Could not apply conditional formatting: %s", e)
+    def _column_widths(self, data: List[Tuple]) -> List[int]:
+        """Compute readable column widths from the values about to be written"""
+        widths = [len(header) for header in self._HEADERS]
+        for record in data:
+            for i, value in enumerate(record):
+                length = len(str(self._cell_value(value)))
+                if length > widths[i]:
+                    widths[i] = length
+        return [self._clamp_width(length) for length in widths]
     
-    def _optimize_column_widths(self, ws):
+    @staticmethod
+    def _cell_value(value: Any) -> Any:
+        """Value to write for a cell; SQL NULLs (None, NaN, NaT) become blank"""
+        if value is None or pd.isna(value):
+            return ""
+        return value
+    
+    @staticmethod
+    def _clamp_width(length: int) -> int:
+        """Column width for a content length, between 10 and 50 chars"""
+        return min(max(length + 2, 10), 50)
+    
+    def _optimize_column_widths(self, ws, widths: List[int]):
         """Optimize column widths for better readability"""
-        for column_cells in ws.columns:
-            length = max(len(str(cell.value or "")) for cell in column_cells)
-            adjusted_width = min(max(length + 2, 10), 50)  # Between 10 and 50 chars
-            ws.column_dimensions[column_cells[0].column_letter].width = adjusted_width
+        for col_idx, width in enumerate(widths, 1):
+            ws.column_dimensions[get_column_letter(col_idx)].width = width
+    
+    def _summary_data(self, sales: array, units: array) -> List[Tuple[str, Any]]:
+        """Build the summary rows shown below the data table"""
+        # Typed buffers are viewed as NumPy arrays without copying
+        sales_values = np.frombuffer(sales, dtype=np.float64)
+        unit_values = np.frombuffer(units, dtype=np.float64)
+        record_count = len(sales_values)
+        
+        # NULL amounts count as zero, as None already does
+        total_sales = float(np.nansum(sales_values))
+        total_units = int(np.nansum(unit_values))
+        avg_sale = total_sales / record_count if record_count else 0
+        
+        return [
+            ("Total Records:", record_count),
+            ("Total Sales Amount:", f"{total_sales:,.0f} CLP"),
+            ("Total Units Sold:", f"{total_units:,}"),
+            ("Average Sale Value:", f"{avg_sale:,.0f} CLP")
+        ]
     
-    def _add_summary_statistics(self, ws, data: List[Dict[str, Any]]):
+    def _add_summary_statistics(self, ws, sales: array, units: array):
         """Add summary statistics at the bottom"""
         try:
-            if not data:
+            if not sales:
                 return
             
-            last_row = ws.max_row + 2
-            
-            # Calculate totals
-            total_sales = sum(float(record.get('Total', 0)) for record in data)
-            total_units = sum(int(record.get('Unidad', 0)) for record in data)
-            avg_sale = total_sales / len(data) if data else 0
-            
-            # Add summary
-            summary_data = [
-                ("Total Records:", len(data)),
-                ("Total Sales Amount:", f"{total_sales:,.0f} CLP"),
-                ("Total Units Sold:", f"{total_units:,}"),
-                ("Average Sale Value:", f"{avg_sale:,.0f} CLP")
-            ]
-            
-            for i, (label, value) in enumerate(summary_data):
-                ws.cell(row=last_row + i, column=1, value=label).font = Font(bold=True)
-                ws.cell(row=last_row + i, column=2, value=value)
+            ws.append([])
+            label_font = Font(bold=True)
+            for label, value in self._summary_data(sales, units):
+                ws.append([self._styled_cell(ws, label, font=label_font), value])
                 
         except Exception as e:
             logger.warning("Could not add summary statistics: %s", e)
 
 
+class CheckableListModel(QAbstractListModel):
+    """
+    Flat list of labels with one check flag per row
+    
+    Stores only the strings and a parallel list of booleans; the view
+    paints check boxes for the visible rows, so no per-item objects are
+    created however long the list is.
+    """
+    
+    def __init__(self, items: List[str], checked: Iterable[str], parent=None):
+        super().__init__(parent)
+        checked = checked if isinstance(checked, (set, frozenset)) else frozenset(checked)
+        self._items = list(items)
+        self._checked = [item in checked for item in self._items]
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._items[index.row()]
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if self._checked[index.row()] else Qt.CheckState.Unchecked
+        return None
+    
+    def setData(self, index: QModelIndex, value: Any,
+                role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        # Views hand the new state over as either the enum or its int value
+        self._checked[index.row()] = value in (Qt.CheckState.Checked, Qt.CheckState.Checked.value)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+    
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsUserCheckable)
+    
+    def text(self, row: int) -> str:
+        return self._items[row]
+    
+    def is_checked(self, row: int) -> bool:
+        return self._checked[row]
+    
+    def set_checked(self, rows: List[int], checked: bool):
+        """Set the check flag for many rows with a single change notification"""
+        if not rows:
+            return
+        for row in rows:
+            self._checked[row] = checked
+        self.dataChanged.emit(self.index(min(rows)), self.index(max(rows)),
+                              [Qt.ItemDataRole.CheckStateRole])
+
+
 class MultiSelectDialog(QDialog):
     """
     Advanced Multi-Selection Dialog Component
@@ -439,14 +924,16 @@ class MultiSelectDialog(QDialog):
     - Keyboard shortcuts support
     """
     
-    def __init__(self, title: str, items: List[str], parent=None):
+    def __init__(self, title: str, items: List[str], parent=None,
+                 selected: Optional[Iterable[str]] = None):
         super().__init__(parent)
         self.setWindowTitle(title)
         self.setModal(True)
         self.setMinimumSize(300, 400)
         
-        self.checkboxes = {}
         self.items = items
+        # Items start checked unless an explicit selection is given
+        self.selected = frozenset(items if selected is None else selected)
         
         self._setup_ui()
         self._setup_connections()
@@ -470,22 +957,20 @@ class MultiSelectDialog(QDialog):
         button_layout.addWidget(self.select_none_btn)
         layout.addLayout(button_layout)
         
-        # Checkboxes container
-        self.checkbox_widget = QWidget()
-        self.checkbox_layout = QVBoxLayout(self.checkbox_widget)
+        # Checkable item model; the proxy filters it on the Qt side
+        self.item_model = CheckableListModel(self.items, self.selected, self)
         
-        for item in self.items:
-            checkbox = QCheckBox(item)
-            checkbox.setChecked(True)  # Default selected
-            self.checkboxes[item] = checkbox
-            self.checkbox_layout.addWidget(checkbox)
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.item_model)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        # Check toggles never change which rows match the search text, so the
+        # proxy only re-filters when the text changes, not on every dataChanged
+        self.proxy_model.setDynamicSortFilter(False)
         
-        # Scroll area for many items
-        from PyQt6.QtWidgets import QScrollArea
-        scroll_area = QScrollArea()
-        scroll_area.setWidget(self.checkbox_widget)
-        scroll_area.setWidgetResizable(True)
-        layout.addWidget(scroll_area)
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy_model)
+        self.list_view.setUniformItemSizes(True)
+        layout.addWidget(self.list_view)
         
         # Action buttons
         action_layout = QHBoxLayout()
@@ -507,43 +992,183 @@ class MultiSelectDialog(QDialog):
     
     def _filter_items(self, search_text: str):
         """Filter items based on search text"""
-        for item, checkbox in self.checkboxes.items():
-            visible = search_text.lower() in item.lower()
-            checkbox.setVisible(visible)
+        self.proxy_model.setFilterFixedString(search_text)
+    
+    def _visible_rows(self) -> List[int]:
+        """Source rows that pass the current filter"""
+        proxy = self.proxy_model
+        return [proxy.mapToSource(proxy.index(row, 0)).row()
+                for row in range(proxy.rowCount())]
+    
+    def _set_visible_checked(self, checked: bool):
+        """Check or uncheck all visible items with a single repaint"""
+        self.list_view.setUpdatesEnabled(False)
+        try:
+            self.item_model.set_checked(self._visible_rows(), checked)
+        finally:
+            self.list_view.setUpdatesEnabled(True)
     
     def _select_all(self):
-        """Select all visible checkboxes"""
-        for checkbox in self.checkboxes.values():
-            if checkbox.isVisible():
-                checkbox.setChecked(True)
+        """Select all visible items"""
+        self._set_visible_checked(True)
     
     def _select_none(self):
-        """Deselect all visible checkboxes"""
-        for checkbox in self.checkboxes.values():
-            if checkbox.isVisible():
-                checkbox.setChecked(False)
+        """Deselect all visible items"""
+        self._set_visible_checked(False)
     
     def get_checked_items(self) -> List[str]:
         """Get list of checked items"""
-        return [item for item, checkbox in self.checkboxes.items() 
-                if checkbox.isChecked() and checkbox.isVisible()]
+        model = self.item_model
+        return [model.text(row) for row in self._visible_rows() if model.is_checked(row)]
+
+
+class SalesResultsModel(QAbstractTableModel):
+    """
+    Table model backing the search results view
+    
+    Holds the results DataFrame as one NumPy array per displayed column
+    and formats cells lazily in data(), so only the rows the view actually
+    paints are converted to text. Large result sets are shown PAGE_SIZE
+    rows at a time; sorting reorders a row index array over the whole set
+    with NumPy, so pages follow the sort order across all results.
+    """
+    
+    HEADERS = (
+        "No", "Artículo", "Punto de venta", "Fecha", "Tipo documento",
+        "N° documento", "Unidad", "Kilos", "Valor/U", "Descuento", 
+        "Neto", "IVA", "Total", "Neto/KG", "Pago", "N° comprobante", "Medio pago"
+    )
+    
+    # Record keys for display columns 1..16 (VentaID is not displayed)
+    _KEYS = (
+        'Articulo', 'PuntoVenta', 'Fecha', 'TipoDocumento', 'NumeroDocumento',
+        'Unidad', 'KilosTotales', 'ValorUnitario', 'Descuento', 'Neto', 'IVA',
+        'Total', 'NetoPorKG', 'Pago', 'NumeroComprobante', 'MedioPago'
+    )
+    
+    CURRENCY_COLUMNS = frozenset({8, 9, 10, 11, 12, 13})
+    NUMERIC_COLUMNS = frozenset({6, 7}) | CURRENCY_COLUMNS
+    
+    # Rows exposed to the view per page
+    PAGE_SIZE = 500
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._columns: Tuple[np.ndarray, ...] = ()
+        self._row_count = 0
+        self._order = np.arange(0)  # Result row shown at each sorted position
+        self._offset = 0
+    
+    def set_frame(self, frame: Optional[pd.DataFrame]):
+        """Replace the model contents with a single reset (None clears it)"""
+        self.beginResetModel()
+        if frame is None:
+            self._columns = ()
+            self._row_count = 0
+        else:
+            self._columns = tuple(self._column_values(frame, key) for key in self._KEYS)
+            self._row_count = len(frame)
+        self._order = np.arange(self._row_count)
+        self._offset = 0
+        self.endResetModel()
+    
+    def page(self) -> int:
+        """Zero-based index of the page on display"""
+        return self._offset // self.PAGE_SIZE
+    
+    def page_count(self) -> int:
+        """Number of pages (at least one, even when empty)"""
+        return max(1, -(-self._row_count // self.PAGE_SIZE))
+    
+    def set_page(self, page: int):
+        """Show another page, clamped to the available range"""
+        page = min(max(page, 0), self.page_count() - 1)
+        if page * self.PAGE_SIZE == self._offset:
+            return
+        self.beginResetModel()
+        self._offset = page * self.PAGE_SIZE
+        self.endResetModel()
+    
+    def sort(self, column: int, order: Qt.SortOrder = Qt.SortOrder.AscendingOrder):
+        """Sort all results by a column and return to the first page"""
+        if column == 0 or not self._row_count:
+            keys = np.arange(self._row_count)
+        elif column in self.NUMERIC_COLUMNS:
+            keys = pd.to_numeric(pd.Series(self._columns[column - 1]),
+                                 errors='coerce').fillna(0).to_numpy()
+        else:
+            keys = pd.Series(self._columns[column - 1]).fillna('').astype(str).to_numpy()
+        
+        self.layoutAboutToBeChanged.emit()
+        self._order = np.argsort(keys, kind='stable')
+        if order == Qt.SortOrder.DescendingOrder:
+            self._order = self._order[::-1]
+        self._offset = 0
+        self.layoutChanged.emit()
+    
+    def source_rows(self) -> np.ndarray:
+        """Result rows of every page, in the current sort order"""
+        return self._order
+    
+    @staticmethod
+    def _column_values(frame: pd.DataFrame, key: str) -> np.ndarray:
+        """Extract one column; dates are pre-rendered as sortable ISO text"""
+        if key == 'Fecha':
+            return frame[key].dt.strftime('%Y-%m-%d').fillna('').to_numpy()
+        return frame[key].to_numpy()
+    
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return min(self.PAGE_SIZE, self._row_count - self._offset)
+    
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section: int, orientation: Qt.Orientation,
+                   role: int = Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.cell_text(self._order[self._offset + index.row()], index.column())
+        
+        return None
+    
+    def cell_text(self, row: int, col: int) -> str:
+        """Display text for a result row (in result order) and column"""
+        if col == 0:
+            return str(row + 1)
+        value = self._columns[col - 1][row]
+        if col in self.CURRENCY_COLUMNS:
+            return _format_currency(value)
+        return str(value) if value is not None else ''
 
 
-class SearchResultsTable(QTableWidget):
+class SearchResultsTable(QTableView):
     """
     Advanced Search Results Table Component
     
-    Enhanced table widget featuring:
+    Enhanced table view featuring:
     - Professional formatting and styling
     - Currency formatting with locale support
     - Sortable columns with type awareness
     - Context menus and keyboard shortcuts
-    - Optimized rendering for large datasets
+    - Model/view rendering that scales to large datasets
     """
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.locale = QLocale(QLocale.Language.Spanish, QLocale.Country.Chile)
+        self.results_model = SalesResultsModel(self)
+        self.setModel(self.results_model)
         self._setup_table_properties()
         logger.info("SearchResultsTable initialized")
     
@@ -554,10 +1179,11 @@ class SearchResultsTable(QTableWidget):
         self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.setAlternatingRowColors(True)
         
-        # Header configuration
+        # Header configuration; columns are fixed so widths are set once
         self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
         self.horizontalHeader().setStretchLastSection(True)
         self.verticalHeader().setVisible(False)
+        self._apply_header_widths(SalesResultsModel.HEADERS)
         
         # Performance optimizations
         self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
@@ -566,100 +1192,51 @@ class SearchResultsTable(QTableWidget):
         # Sorting
         self.setSortingEnabled(True)
     
-    def populate_results(self, data: List[Dict[str, Any]]):
+    def populate_results(self, data: pd.DataFrame):
         """
         Populate table with search results
         
         Args:
-            data (List[Dict]): Search results from database
+            data (pd.DataFrame): Search results from database
         """
         try:
-            if not data:
-                self.setRowCount(0)
-                return
-            
-            # Setup table structure
-            headers = [
-                "No", "Artículo", "Punto de venta", "Fecha", "Tipo documento",
-                "N° documento", "Unidad", "Kilos", "Valor/U", "Descuento", 
-                "Neto", "IVA", "Total", "Neto/KG", "Pago", "N° comprobante", "Medio pago"
-            ]
-            
-            self.setRowCount(len(data))
-            self.setColumnCount(len(headers))
-            self.setHorizontalHeaderLabels(headers)
-            
-            # Populate data
-            for row_idx, record in enumerate(data):
-                # Row number
-                self.setItem(row_idx, 0, QTableWidgetItem(str(row_idx + 1)))
-                
-                # Data columns (skip VentaID from display)
-                data_values = [
-                    record.get('Articulo', ''),
-                    record.get('PuntoVenta', ''),
-                    record.get('Fecha', ''),
-                    record.get('TipoDocumento', ''),
-                    record.get('NumeroDocumento', ''),
-                    record.get('Unidad', ''),
-                    record.get('KilosTotales', ''),
-                    record.get('ValorUnitario', ''),
-                    record.get('Descuento', ''),
-                    record.get('Neto', ''),
-                    record.get('IVA', ''),
-                    record.get('Total', ''),
-                    record.get('NetoPorKG', ''),
-                    record.get('Pago', ''),
-                    record.get('NumeroComprobante', ''),
-                    record.get('MedioPago', '')
-                ]
-                
-                for col_idx, value in enumerate(data_values, 1):
-                    # Format currency values
-                    if col_idx in [8, 9, 10, 11, 12, 13]:  # Currency columns
-                        formatted_value = self._format_currency(value)
-                        item = QTableWidgetItem(formatted_value)
-                        item.setData(Qt.ItemDataRole.UserRole, float(value) if value else 0)
-                    else:
-                        item = QTableWidgetItem(str(value) if value is not None else '')
-                    
-                    item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-                    self.setItem(row_idx, col_idx, item)
-            
-            # Optimize column widths
-            self.resizeColumnsToContents()
-            
+            self.results_model.set_frame(data)
             logger.info("Populated table with %d records", len(data))
             
         except Exception as e:
             logger.error("Error populating search results: %s", e)
             QMessageBox.critical(self, "Error", f"Error displaying results: {str(e)}")
     
-    def _format_currency(self, value: Any) -> str:
-        """Format currency values using Chilean locale"""
-        try:
-            if value is None or value == '':
-                return '$0'
-            
-            numeric_value = float(value) if isinstance(value, (int, float, str)) else 0
-            return self.locale.toCurrencyString(numeric_value, "$")
-            
-        except (ValueError, TypeError):
-            return '$0'
+    def clear_results(self):
+        """Remove all rows from the table"""
+        self.results_model.set_frame(None)
+    
+    def _apply_header_widths(self, headers: Iterable[str]):
+        """Set fixed column widths derived from header text length"""
+        metrics = self.horizontalHeader().fontMetrics()
+        self._header_widths = [max(metrics.horizontalAdvance(header) + 32, 90)
+                               for header in headers]
+        for col_idx, width in enumerate(self._header_widths):
+            self.setColumnWidth(col_idx, width)
+    
+    def sizeHintForColumn(self, column: int) -> int:
+        """Header-derived width, so resize-to-contents never formats every cell"""
+        if 0 <= column < len(self._header_widths):
+            return self._header_widths[column]
+        return super().sizeHintForColumn(column)
     
     def get_export_data(self) -> List[Dict[str, Any]]:
-        """Get table data formatted for export"""
+        """Get table data formatted for export, in the current sort order"""
         export_data = []
         
         try:
-            for row in range(self.rowCount()):
-                record = {}
-                for col in range(self.columnCount()):
-                    header = self.horizontalHeaderItem(col).text()
-                    item = self.item(row, col)
-                    value = item.text() if item else ""
-                    record[header] = value
-                export_data.append(record)
+            model = self.results_model
+            headers = SalesResultsModel.HEADERS
+            for row in model.source_rows():
+                export_data.append({
+                    header: model.cell_text(row, col)
+                    for col, header in enumerate(headers)
+                })
             
             return export_data
             
@@ -668,6 +1245,149 @@ class SearchResultsTable(QTableWidget):
             return []
 
 
+class SearchWorkerSignals(QObject):
+    """
+    Signals emitted by SearchWorker jobs
+    
+    Every job carries the id of the search that started it, so the dialog
+    can drop results from searches that have since been superseded.
+    """
+    
+    finished = pyqtSignal(int, object, object)  # search id, filters, DataFrame
+    error = pyqtSignal(int, str)
+
+
+class SearchWorker(QRunnable):
+    """
+    Background search job
+    
+    Runs on a QThreadPool thread with a connection borrowed from the pool
+    (MySQL connections must not be used by two threads at once) and streams
+    the rows into a results DataFrame, so the dialog stays responsive while
+    the query runs.
+    """
+    
+    def __init__(self, search_id: int, query_builder: DatabaseQueryBuilder,
+                 filters: SearchFilters, pool: ConnectionPool,
+                 signals: SearchWorkerSignals):
+        super().__init__()
+        self.search_id = search_id
+        self.query_builder = query_builder
+        self.filters = filters
+        self.pool = pool
+        self.signals = signals
+    
+    def run(self):
+        """Execute the search and emit the resulting DataFrame"""
+        try:
+            with self.pool.connection() as conn:
+                results = _results_frame_from_chunks(
+                    self.query_builder.iter_result_chunks(conn, self.filters, pool=self.pool)
+                )
+            self.signals.finished.emit(self.search_id, self.filters, results)
+            
+        except Exception as e:
+            logger.error("Search worker failed: %s", e)
+            self.signals.error.emit(self.search_id, str(e))
+
+
+def _report_uncaught_exception(exc_type, exc_value, exc_traceback):
+    """
+    sys.excepthook for the dialog's event handlers
+    
+    UI handlers only guard operations that can really fail (database and
+    file I/O); anything else that escapes a slot lands here, is logged and
+    shown in the active window's status bar instead of aborting Qt.
+    """
+    logger.error("Unhandled exception: %s", exc_value,
+                 exc_info=(exc_type, exc_value, exc_traceback))
+    window = QApplication.activeWindow()
+    status_bar = getattr(window, "status_bar", None)
+    if status_bar is not None:
+        status_bar.showMessage(f"Unexpected error: {exc_value}", 5000)
+
+
+# Dialog stylesheet, parsed by Qt once per dialog in _apply_styling.
+# Panel spacing comes from layout margins rather than QFrame margin/padding
+_STYLE_SHEET = """
+    QDialog {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+                   stop:0 #f8f9fa, stop:1 #e9ecef);
+    }
+    
+    QFrame {
+        background: white;
+        border: 1px solid #dee2e6;
+        border-radius: 8px;
+    }
+    
+    QPushButton {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                   stop:0 #0d6efd, stop:1 #0b5ed7);
+        color: white;
+        border: none;
+        border-radius: 6px;
+        padding: 8px 16px;
+        font-weight: bold;
+        min-width: 120px;
+    }
+    
+    QPushButton:hover {
+        background: #0b5ed7;
+    }
+    
+    QPushButton:pressed {
+        background: #0a58ca;
+    }
+    
+    QPushButton:disabled {
+        background: #6c757d;
+        color: #adb5bd;
+    }
+    
+    QLineEdit, QDateEdit {
+        border: 2px solid #ced4da;
+        border-radius: 4px;
+        padding: 8px;
+        font-size: 12px;
+        background: white;
+    }
+    
+    QLineEdit:focus, QDateEdit:focus {
+        border-color: #0d6efd;
+        outline: none;
+    }
+    
+    QLabel {
+        font-weight: bold;
+        color: #495057;
+    }
+    
+    QTableView {
+        gridline-color: #dee2e6;
+        background: white;
+        alternate-background-color: #f8f9fa;
+        selection-background-color: #0d6efd;
+        selection-color: white;
+    }
+    
+    QHeaderView::section {
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                   stop:0 #495057, stop:1 #343a40);
+        color: white;
+        padding: 8px;
+        border: none;
+        font-weight: bold;
+    }
+    
+    QStatusBar {
+        background: #f8f9fa;
+        border-top: 1px solid #dee2e6;
+        color: #6c757d;
+    }
+"""
+
+
 class AdvancedSearchSystem(QDialog):
     """
     Advanced Sales Search & Reporting System
@@ -687,19 +1407,58 @@ class AdvancedSearchSystem(QDialog):
     - International support with proper localization
     """
     
+    # Recent result sets kept for auto-searches that return to earlier filters
+    _RESULTS_CACHE_SIZE = 8
+    
+    # Reference list queries, cached module-wide by _cached_reference
+    _REFERENCE_QUERIES = {
+        "branches": "SELECT Sucursal FROM Sucursales ORDER BY ID",
+        "document_types": "SELECT Tipo FROM TipoVenta ORDER BY ID",
+        "products": "SELECT Producto FROM Productos ORDER BY ID",
+    }
+    
+    # Selector dialogs: kind -> (title, available list attribute, selection attribute)
+    _SELECTORS = {
+        "branches": ("Select Branches", "available_branches", "selected_branches"),
+        "types": ("Select Document Types", "available_types", "selected_types"),
+        "products": ("Select Products", "available_products", "selected_products"),
+    }
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         
         # Core components initialization
         self.query_builder = DatabaseQueryBuilder()
         self.excel_exporter = ExcelExportEngine()
-        self.database_connection = None
+        self.connection_pool = _connection_pool
+        
+        # Route exceptions escaping UI handlers to the log and status bar,
+        # unless the host application installed its own hook
+        if sys.excepthook is sys.__excepthook__:
+            sys.excepthook = _report_uncaught_exception
+        self.database_available = False
         
         # UI state management
-        self.selected_branches = []
-        self.selected_products = []
-        self.selected_types = []
-        self.current_results = []
+        # Selections are frozensets (O(1) membership, order-free equality);
+        # None means everything is selected
+        self.selected_branches: Optional[FrozenSet[str]] = None
+        self.selected_products: Optional[FrozenSet[str]] = None
+        self.selected_types: Optional[FrozenSet[str]] = None
+        self.available_branches: List[str] = []
+        self.available_types: List[str] = []
+        self.available_products: Optional[List[str]] = None  # Loaded on first use
+        self.current_results = _results_frame(())
+        self._last_search_key = None  # Filters behind current_results
+        self._force_search = False  # Next search bypasses cached results
+        self._interactive_search = False  # Next search may prompt the user
+        self._results_cache: "OrderedDict[SearchFilters, pd.DataFrame]" = OrderedDict()
+        
+        # Background searches; only the latest search id is displayed
+        self.search_pool = QThreadPool(self)
+        self.search_signals = SearchWorkerSignals(self)
+        self.search_signals.finished.connect(self._on_search_finished)
+        self.search_signals.error.connect(self._on_search_failed)
+        self._search_id = 0
         
         # Performance monitoring
         self.search_timer = QTimer()
@@ -738,8 +1497,18 @@ class AdvancedSearchSystem(QDialog):
         action_panel = self._create_action_panel()
         main_layout.addWidget(action_panel)
         
-        # Status bar
+        # Keep page navigation in step with new results, paging and sorting
+        results_model = self.results_table.results_model
+        results_model.modelReset.connect(self._update_page_controls)
+        results_model.layoutChanged.connect(self._update_page_controls)
+        
+        # Status bar with a busy indicator shown while a query runs
         self.status_bar = QStatusBar()
+        self.search_progress = QProgressBar()
+        self.search_progress.setRange(0, 0)
+        self.search_progress.setMaximumWidth(160)
+        self.search_progress.setVisible(False)
+        self.status_bar.addPermanentWidget(self.search_progress)
         main_layout.addWidget(self.status_bar)
         
         self.setLayout(main_layout)
@@ -754,6 +1523,7 @@ class AdvancedSearchSystem(QDialog):
         
         # Main filter layout
         filter_layout = QVBoxLayout()
+        filter_layout.setContentsMargins(10, 10, 10, 10)
         
         # Date range section
         date_layout = QHBoxLayout()
@@ -769,6 +1539,10 @@ class AdvancedSearchSystem(QDialog):
         self.end_date_filter.setDate(QDate.currentDate())
         self.end_date_filter.setDisplayFormat("dd-MM-yyyy")
         
+        # Coalesce bursts of edits into one search via the debounce timer
+        self.start_date_filter.dateChanged.connect(lambda *_: self._trigger_auto_search())
+        self.end_date_filter.dateChanged.connect(lambda *_: self._trigger_auto_search())
+        
         date_layout.addWidget(QLabel("From:"))
         date_layout.addWidget(self.start_date_filter)
         date_layout.addWidget(QLabel("To:"))
@@ -780,15 +1554,15 @@ class AdvancedSearchSystem(QDialog):
         
         # Branch selection
         self.branch_button = QPushButton("Select Branches")
-        self.branch_button.clicked.connect(self._show_branch_selector)
+        self.branch_button.clicked.connect(lambda: self._show_selector("branches"))
         
         # Document type selection
         self.type_button = QPushButton("Select Document Types")
-        self.type_button.clicked.connect(self._show_type_selector)
+        self.type_button.clicked.connect(lambda: self._show_selector("types"))
         
         # Product selection
         self.product_button = QPushButton("Select Products")
-        self.product_button.clicked.connect(self._show_product_selector)
+        self.product_button.clicked.connect(lambda: self._show_selector("products"))
         
         # Document number search
         self.document_input = QLineEdit()
@@ -812,11 +1586,16 @@ class AdvancedSearchSystem(QDialog):
         self.clear_button = QPushButton("🗑️ Clear Filters")
         self.clear_button.clicked.connect(self._clear_filters)
         
+        self.refresh_lists_button = QPushButton("🔄 Refresh Lists")
+        self.refresh_lists_button.setToolTip("Reload branches, document types and products")
+        self.refresh_lists_button.clicked.connect(self._refresh_reference_data)
+        
         self.auto_search_checkbox = QCheckBox("Auto-search on filter change")
         self.auto_search_checkbox.setChecked(True)
         
         search_layout.addWidget(self.search_button)
         search_layout.addWidget(self.clear_button)
+        search_layout.addWidget(self.refresh_lists_button)
         search_layout.addWidget(self.auto_search_checkbox)
         search_layout.addStretch()
         
@@ -834,6 +1613,7 @@ class AdvancedSearchSystem(QDialog):
         panel.setFrameStyle(QFrame.Shape.StyledPanel)
         
         action_layout = QHBoxLayout()
+        action_layout.setContentsMargins(10, 10, 10, 10)
         
         # Export controls
         self.export_button = QPushButton("📊 Export to Excel")
@@ -842,6 +1622,11 @@ class AdvancedSearchSystem(QDialog):
         
         # Navigation controls
         self.results_label = QLabel("No results")
+        self.prev_page_button = QPushButton("◀ Prev")
+        self.prev_page_button.clicked.connect(lambda: self._change_page(-1))
+        self.page_label = QLabel()
+        self.next_page_button = QPushButton("Next ▶")
+        self.next_page_button.clicked.connect(lambda: self._change_page(1))
         
         # Action buttons
         self.close_button = QPushButton("❌ Close")
@@ -849,102 +1634,46 @@ class AdvancedSearchSystem(QDialog):
         
         action_layout.addWidget(self.results_label)
         action_layout.addStretch()
+        action_layout.addWidget(self.prev_page_button)
+        action_layout.addWidget(self.page_label)
+        action_layout.addWidget(self.next_page_button)
+        action_layout.addStretch()
         action_layout.addWidget(self.export_button)
         action_layout.addWidget(self.close_button)
         
         panel.setLayout(action_layout)
+        self._update_page_controls()
         return panel
     
+    def _change_page(self, step: int):
+        """Move the results table by ``step`` pages"""
+        model = self.results_table.results_model
+        model.set_page(model.page() + step)
+    
+    def _update_page_controls(self):
+        """Show page navigation only when the results span several pages"""
+        model = self.results_table.results_model
+        page, pages = model.page(), model.page_count()
+        self.page_label.setText(f"Page {page + 1} of {pages}")
+        self.prev_page_button.setEnabled(page > 0)
+        self.next_page_button.setEnabled(page + 1 < pages)
+        for widget in (self.prev_page_button, self.page_label, self.next_page_button):
+            widget.setVisible(pages > 1)
+    
     def _apply_styling(self):
         """Apply professional styling to the interface"""
-        self.setStyleSheet("""
-            QDialog {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                           stop:0 #f8f9fa, stop:1 #e9ecef);
-            }
-            
-            QFrame {
-                background: white;
-                border: 1px solid #dee2e6;
-                border-radius: 8px;
-                margin: 5px;
-                padding: 10px;
-            }
-            
-            QPushButton {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                           stop:0 #0d6efd, stop:1 #0b5ed7);
-                color: white;
-                border: none;
-                border-radius: 6px;
-                padding: 8px 16px;
-                font-weight: bold;
-                min-width: 120px;
-            }
-            
-            QPushButton:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                           stop:0 #0b5ed7, stop:1 #0a58ca);
-            }
-            
-            QPushButton:pressed {
-                background: #0a58ca;
-            }
-            
-            QPushButton:disabled {
-                background: #6c757d;
-                color: #adb5bd;
-            }
-            
-            QLineEdit, QDateEdit {
-                border: 2px solid #ced4da;
-                border-radius: 4px;
-                padding: 8px;
-                font-size: 12px;
-                background: white;
-            }
-            
-            QLineEdit:focus, QDateEdit:focus {
-                border-color: #0d6efd;
-                outline: none;
-            }
-            
-            QLabel {
-                font-weight: bold;
-                color: #495057;
-            }
-            
-            QTableWidget {
-                gridline-color: #dee2e6;
-                background: white;
-                alternate-background-color: #f8f9fa;
-                selection-background-color: #0d6efd;
-                selection-color: white;
-            }
-            
-            QHeaderView::section {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                           stop:0 #495057, stop:1 #343a40);
-                color: white;
-                padding: 8px;
-                border: none;
-                font-weight: bold;
-            }
-            
-            QStatusBar {
-                background: #f8f9fa;
-                border-top: 1px solid #dee2e6;
-                color: #6c757d;
-            }
-        """)
+        self.setStyleSheet(_STYLE_SHEET)
     
     def _setup_database_connection(self):
         """Setup database connection with error handling"""
         try:
-            self.database_connection = conectar()
-            if self.database_connection is None:
-                raise Exception("Could not establish database connection")
+            # Open (or revalidate) a pooled connection up front
+            with self.connection_pool.connection() as conn:
+                if CMySQLConnection is None or not isinstance(conn, CMySQLConnection):
+                    logger.warning("MySQL connection uses the pure-Python protocol; "
+                                   "enable the C extension (use_pure=False) for faster result fetching")
             
+            self.database_available = True
             logger.info("Database connection established successfully")
             self.status_bar.showMessage("Connected to database", 3000)
             
@@ -957,111 +1686,95 @@ class AdvancedSearchSystem(QDialog):
     def _load_initial_data(self):
         """Load initial data for dropdowns and filters"""
         try:
-            if not self.database_connection:
+            if not self.database_available:
                 return
             
             # Load branches
-            self.available_branches = self._fetch_branches()
-            self.selected_branches = self.available_branches.copy()
+            self.available_branches = self._fetch_reference("branches")
+            self.selected_branches = None
             
             # Load document types
-            self.available_types = self._fetch_document_types()
-            self.selected_types = self.available_types.copy()
+            self.available_types = self._fetch_reference("document_types")
+            self.selected_types = None
             
-            # Load products
-            self.available_products = self._fetch_products()
-            self.selected_products = self.available_products.copy()
+            # Products can run to thousands of rows; they are fetched the
+            # first time the product selector opens
+            self.available_products = None
+            self.selected_products = None
             
             # Update UI labels
             self._update_filter_labels()
             
-            logger.info("Initial data loaded: %d branches, %d types, %d products",
-                       len(self.available_branches), len(self.available_types), 
-                       len(self.available_products))
+            logger.info("Initial data loaded: %d branches, %d types",
+                       len(self.available_branches), len(self.available_types))
             
         except Exception as e:
             logger.error("Error loading initial data: %s", e)
             self.status_bar.showMessage("Error loading initial data", 5000)
     
-    def _fetch_branches(self) -> List[str]:
-        """Fetch available branches from database"""
-        try:
-            cursor = self.database_connection.cursor()
-            cursor.execute("SELECT Sucursal FROM Sucursales ORDER BY ID")
-            branches = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            return branches
-        except Exception as e:
-            logger.error("Error fetching branches: %s", e)
-            return []
-    
-    def _fetch_document_types(self) -> List[str]:
-        """Fetch available document types from database"""
-        try:
-            cursor = self.database_connection.cursor()
-            cursor.execute("SELECT Tipo FROM TipoVenta ORDER BY ID")
-            types = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            return types
-        except Exception as e:
-            logger.error("Error fetching document types: %s", e)
-            return []
+    def _refresh_reference_data(self):
+        """Drop the cached reference lists and result sets and reload the lists"""
+        _invalidate_reference_cache()
+        self._results_cache.clear()
+        self._load_initial_data()
+        self.status_bar.showMessage("Reference lists reloaded", 3000)
     
-    def _fetch_products(self) -> List[str]:
-        """Fetch available products from database"""
+    def _fetch_reference(self, key: str) -> List[str]:
+        """Fetch a reference list (see _REFERENCE_QUERIES) from the database"""
         try:
-            cursor = self.database_connection.cursor()
-            cursor.execute("SELECT Producto FROM Productos ORDER BY ID")
-            products = [row[0] for row in cursor.fetchall()]
-            cursor.close()
-            return products
+            return _cached_reference(key, self._REFERENCE_QUERIES[key], self.connection_pool)
         except Exception as e:
-            logger.error("Error fetching products: %s", e)
+            logger.error("Error fetching %s: %s", key, e)
             return []
     
-    def _show_branch_selector(self):
-        """Show branch selection dialog"""
-        dialog = MultiSelectDialog("Select Branches", self.available_branches, self)
+    def _show_selector(self, kind: str):
+        """
+        Show the selection dialog for one filter kind
         
-        # Pre-select current selection
-        for item, checkbox in dialog.checkboxes.items():
-            checkbox.setChecked(item in self.selected_branches)
+        Labels are refreshed and an auto-search queued only when the
+        accepted selection differs from the current one.
         
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.selected_branches = dialog.get_checked_items()
-            self._update_filter_labels()
-            self._trigger_auto_search()
+        Args:
+            kind (str): Key of _SELECTORS ('branches', 'types' or 'products')
+        """
+        title, available_attr, selected_attr = self._SELECTORS[kind]
+        available = getattr(self, available_attr)
+        if available is None:
+            # Lazily loaded list (products), fetched on first open
+            if not self.database_available:
+                return
+            available = self._fetch_reference("products")
+            setattr(self, available_attr, available)
+            setattr(self, selected_attr, None)
+        
+        previous = getattr(self, selected_attr)
+        dialog = MultiSelectDialog(title, available, self, selected=previous)
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        selection = self._selection_from(dialog, available)
+        if selection == previous:
+            return
+        setattr(self, selected_attr, selection)
+        self._update_filter_labels()
+        self._trigger_auto_search()
     
-    def _show_type_selector(self):
-        """Show document type selection dialog"""
-        dialog = MultiSelectDialog("Select Document Types", self.available_types, self)
-        
-        # Pre-select current selection
-        for item, checkbox in dialog.checkboxes.items():
-            checkbox.setChecked(item in self.selected_types)
-        
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.selected_types = dialog.get_checked_items()
-            self._update_filter_labels()
-            self._trigger_auto_search()
+    @staticmethod
+    def _selection_from(dialog: MultiSelectDialog,
+                        available: List[str]) -> Optional[FrozenSet[str]]:
+        """Checked items of a selector dialog, or None when all are checked"""
+        checked = frozenset(dialog.get_checked_items())
+        return None if len(checked) == len(available) else checked
     
-    def _show_product_selector(self):
-        """Show product selection dialog"""
-        dialog = MultiSelectDialog("Select Products", self.available_products, self)
-        
-        # Pre-select current selection
-        for item, checkbox in dialog.checkboxes.items():
-            checkbox.setChecked(item in self.selected_products)
-        
-        if dialog.exec() == QDialog.DialogCode.Accepted:
-            self.selected_products = dialog.get_checked_items()
-            self._update_filter_labels()
-            self._trigger_auto_search()
+    @staticmethod
+    def _selection_count(selected: Optional[FrozenSet[str]], available: List[str]) -> int:
+        """Number of selected items, resolving the 'all selected' sentinel"""
+        return len(available) if selected is None else len(selected)
     
     def _update_filter_labels(self):
         """Update filter button labels to show selection status"""
         # Branch button
-        if len(self.selected_branches) == len(self.available_branches):
+        if self.selected_branches is None:
             self.branch_button.setText("All Branches")
         elif len(self.selected_branches) == 0:
             self.branch_button.setText("No Branches")
@@ -1069,7 +1782,7 @@ class AdvancedSearchSystem(QDialog):
             self.branch_button.setText(f"{len(self.selected_branches)} Branches")
         
         # Type button
-        if len(self.selected_types) == len(self.available_types):
+        if self.selected_types is None:
             self.type_button.setText("All Types")
         elif len(self.selected_types) == 0:
             self.type_button.setText("No Types")
@@ -1077,7 +1790,7 @@ class AdvancedSearchSystem(QDialog):
             self.type_button.setText(f"{len(self.selected_types)} Types")
         
         # Product button
-        if len(self.selected_products) == len(self.available_products):
+        if self.selected_products is None:
             self.product_button.setText("All Products")
         elif len(self.selected_products) == 0:
             self.product_button.setText("No Products")
@@ -1085,51 +1798,110 @@ class AdvancedSearchSystem(QDialog):
             self.product_button.setText(f"{len(self.selected_products)} Products")
     
     def _trigger_auto_search(self):
-        """Trigger search if auto-search is enabled"""
+        """Trigger a silent search if auto-search is enabled"""
         if self.auto_search_checkbox.isChecked():
-            self._trigger_search()
+            self._schedule_search()
     
     def _trigger_search(self):
-        """Trigger search with debouncing for performance"""
+        """Trigger an explicit search, always re-querying the database"""
+        self._force_search = True
+        self._interactive_search = True
+        self._schedule_search()
+    
+    def _schedule_search(self):
+        """Schedule search with debouncing for performance"""
         # Stop any pending search
         self.search_timer.stop()
         
         # Start new search timer (300ms delay for debouncing)
         self.search_timer.start(300)
         
-        # Show loading state
-        self.search_button.setText("🔄 Searching...")
-        self.search_button.setEnabled(False)
-        self.status_bar.showMessage("Preparing search...")
+        # Only explicit searches show the loading state; auto-searches
+        # fire while the user is still editing the filters
+        if self._interactive_search:
+            self.search_button.setText("🔄 Searching...")
+            self.search_button.setEnabled(False)
+            self.status_bar.showMessage("Preparing search...")
     
     def _execute_search(self):
-        """Execute the actual search operation"""
+        """Validate the filters and start the search on a worker thread"""
+        started = False
+        force, self._force_search = self._force_search, False
+        interactive, self._interactive_search = self._interactive_search, False
         try:
+            # Read the dates once; they feed both validation and the filters
+            start_date = self.start_date_filter.date().toPyDate()
+            end_date = self.end_date_filter.date().toPyDate()
+            
             # Validate inputs
-            if not self._validate_search_criteria():
+            if not self._validate_search_criteria(start_date, end_date, interactive):
                 return
             
             # Build search filters
-            filters = {
-                'start_date': self.start_date_filter.date().toPyDate(),
-                'end_date': self.end_date_filter.date().toPyDate(),
-                'branches': self.selected_branches,
-                'document_types': self.selected_types,
-                'products': self.selected_products,
-                'document_number': self.document_input.text().strip()
-            }
+            filters = SearchFilters(
+                start_date=start_date,
+                end_date=end_date,
+                branches=self.selected_branches,
+                document_types=self.selected_types,
+                products=self.selected_products,
+                document_number=self.document_input.text().strip()
+            )
             
-            # Build and execute query
-            query, parameters = self.query_builder.build_search_query(filters)
+            if not force:
+                # Unchanged filters keep the results already on screen
+                if filters == self._last_search_key:
+                    self.status_bar.showMessage("Filters unchanged; showing current results", 3000)
+                    return
+                
+                # Recently seen filters are served from the results cache
+                cached = self._results_cache.get(filters)
+                if cached is not None:
+                    self._results_cache.move_to_end(filters)
+                    self._search_id += 1  # Supersede any search still in flight
+                    self._show_results(filters, cached)
+                    return
+            
+            # Run the query off the GUI thread; a newer search supersedes
+            # any still in flight
             self.status_bar.showMessage("Executing database query...")
+            self.search_progress.setVisible(True)
             
-            cursor = self.database_connection.cursor(dictionary=True)
-            cursor.execute(query, parameters)
-            results = cursor.fetchall()
-            cursor.close()
+            self._search_id += 1
+            self.search_pool.start(SearchWorker(
+                self._search_id, self.query_builder, filters,
+                self.connection_pool, self.search_signals
+            ))
+            started = True
             
+        except Exception as e:
+            logger.error("Search execution failed: %s", e)
+            QMessageBox.critical(self, "Search Error", f"Search failed: {str(e)}")
+            self.status_bar.showMessage("Search failed", 5000)
+            
+        finally:
+            if not started:
+                self._reset_search_controls()
+    
+    def _on_search_finished(self, search_id: int, filters: SearchFilters,
+                            results: pd.DataFrame):
+        """Show the results delivered by the search worker"""
+        if search_id != self._search_id:
+            return  # Superseded by a newer search
+        
+        # Remember the result set, evicting the least recently used
+        self._results_cache[filters] = results
+        self._results_cache.move_to_end(filters)
+        while len(self._results_cache) > self._RESULTS_CACHE_SIZE:
+            self._results_cache.popitem(last=False)
+        
+        self._show_results(filters, results)
+    
+    def _show_results(self, filters: SearchFilters, results: pd.DataFrame):
+        """Display a result set and update the dependent controls"""
+        try:
             # Update UI with results
             self.current_results = results
+            self._last_search_key = filters
             self.results_table.populate_results(results)
             
             # Update status and controls
@@ -1141,89 +1913,123 @@ class AdvancedSearchSystem(QDialog):
             logger.info("Search completed successfully: %d records found", result_count)
             
         except Exception as e:
-            logger.error("Search execution failed: %s", e)
-            QMessageBox.critical(self, "Search Error", f"Search failed: {str(e)}")
-            self.status_bar.showMessage("Search failed", 5000)
+            logger.error("Error displaying search results: %s", e)
             
         finally:
-            # Reset search button
-            self.search_button.setText("🔍 Search")
-            self.search_button.setEnabled(True)
+            self._reset_search_controls()
     
-    def _validate_search_criteria(self) -> bool:
-        """Validate search criteria before execution"""
-        try:
-            # Date validation
-            start_date = self.start_date_filter.date().toPyDate()
-            end_date = self.end_date_filter.date().toPyDate()
-            
-            if start_date > end_date:
+    def _on_search_failed(self, search_id: int, message: str):
+        """Report a failed background search"""
+        if search_id != self._search_id:
+            return  # Superseded by a newer search
+        
+        logger.error("Search execution failed: %s", message)
+        self._reset_search_controls()
+        QMessageBox.critical(self, "Search Error", f"Search failed: {message}")
+        self.status_bar.showMessage("Search failed", 5000)
+    
+    def _reset_search_controls(self):
+        """Restore the search button and hide the busy indicator"""
+        self.search_progress.setVisible(False)
+        self.search_button.setText("🔍 Search")
+        self.search_button.setEnabled(True)
+    
+    def _validate_search_criteria(self, start_date: date, end_date: date,
+                                  interactive: bool = True) -> bool:
+        """
+        Validate search criteria before execution
+        
+        Auto-searches run with ``interactive=False``: invalid criteria skip
+        the search without a dialog, since the user is mid-edit.
+        """
+        # Date validation
+        if start_date > end_date:
+            if interactive:
                 QMessageBox.warning(self, "Invalid Date Range", 
                                    "Start date cannot be after end date.")
+            return False
+        
+        # Check if date range is too large (performance consideration)
+        date_diff = (end_date - start_date).days
+        if date_diff > 365:
+            if not interactive:
+                self.status_bar.showMessage(
+                    f"Date range of {date_diff} days; press Search to run it", 5000)
                 return False
-            
-            # Check if date range is too large (performance consideration)
-            date_diff = (end_date - start_date).days
-            if date_diff > 365:
-                reply = QMessageBox.question(self, "Large Date Range",
-                                           f"You've selected a date range of {date_diff} days. "
-                                           "This might take a long time. Continue?")
-                if reply != QMessageBox.StandardButton.Yes:
-                    return False
-            
-            # Selection validation
-            if not self.selected_branches:
+            reply = QMessageBox.question(self, "Large Date Range",
+                                       f"You've selected a date range of {date_diff} days. "
+                                       "This might take a long time. Continue?")
+            if reply != QMessageBox.StandardButton.Yes:
+                return False
+        
+        # Selection validation
+        if self.selected_branches is not None and not self.selected_branches:
+            if interactive:
                 QMessageBox.warning(self, "No Branches Selected", 
                                    "Please select at least one branch.")
-                return False
-            
-            # Document number validation
-            doc_number = self.document_input.text().strip()
-            if doc_number and not self.query_builder.validate_input(doc_number, "number"):
+            return False
+        
+        # Document number validation
+        doc_number = self.document_input.text().strip()
+        if doc_number and not self.query_builder.validate_input(doc_number, "number"):
+            if interactive:
                 QMessageBox.warning(self, "Invalid Document Number", 
                                    "Document number contains invalid characters.")
-                return False
-            
-            return True
-            
-        except Exception as e:
-            logger.error("Error validating search criteria: %s", e)
             return False
+        
+        return True
     
     def _clear_filters(self):
         """Clear all search filters and reset to defaults"""
+        # Reset filter widgets without queueing auto-searches
+        filter_widgets = (self.start_date_filter, self.end_date_filter, self.document_input)
+        for widget in filter_widgets:
+            widget.blockSignals(True)
         try:
             # Reset date filters to last 30 days
             self.start_date_filter.setDate(QDate.currentDate().addDays(-30))
             self.end_date_filter.setDate(QDate.currentDate())
             
-            # Reset selections to all items
-            self.selected_branches = self.available_branches.copy()
-            self.selected_types = self.available_types.copy()
-            self.selected_products = self.available_products.copy()
-            
             # Clear document number
             self.document_input.clear()
-            
-            # Update UI
-            self._update_filter_labels()
-            
-            # Clear results
-            self.results_table.setRowCount(0)
-            self.current_results = []
-            self.results_label.setText("Filters cleared")
-            self.export_button.setEnabled(False)
-            
-            self.status_bar.showMessage("Filters cleared", 3000)
-            logger.info("Search filters cleared and reset to defaults")
-            
-        except Exception as e:
-            logger.error("Error clearing filters: %s", e)
+        finally:
+            for widget in filter_widgets:
+                widget.blockSignals(False)
+        
+        # Reset selections to all items
+        self.selected_branches = None
+        self.selected_types = None
+        self.selected_products = None
+        
+        # Update UI
+        self._update_filter_labels()
+        
+        # Clear results
+        self.results_table.clear_results()
+        self.current_results = _results_frame(())
+        self._last_search_key = None
+        self.results_label.setText("Filters cleared")
+        self.export_button.setEnabled(False)
+        
+        self.status_bar.showMessage("Filters cleared", 3000)
+        logger.info("Search filters cleared and reset to defaults")
+    
+    @staticmethod
+    def _iter_rows_in_order(frame: pd.DataFrame, order: np.ndarray) -> Iterator[Tuple]:
+        """
+        Yield result rows as tuples in RESULT_COLUMNS order, following ``order``
+        
+        Reads the frame's column arrays in place, so exporting a sorted view
+        never materializes a reordered copy of the result set.
+        """
+        arrays = [frame[key].array for key in RESULT_COLUMNS]
+        for row in order:
+            yield tuple(values[row] for values in arrays)
     
     def _export_results(self):
         """Export current search results to Excel"""
         try:
-            if not self.current_results:
+            if self.current_results.empty:
                 QMessageBox.information(self, "No Data", "No results to export.")
                 return
             
@@ -1249,9 +2055,10 @@ class AdvancedSearchSystem(QDialog):
             metadata = {
                 "Report Title": "Sales Search Results",
                 "Date Range": f"{start_date} to {end_date}",
-                "Branches": f"{len(self.selected_branches)} selected",
-                "Document Types": f"{len(self.selected_types)} selected", 
-                "Products": f"{len(self.selected_products)} selected",
+                "Branches": f"{self._selection_count(self.selected_branches, self.available_branches)} selected",
+                "Document Types": f"{self._selection_count(self.selected_types, self.available_types)} selected", 
+                "Products": ("All selected" if self.available_products is None else
+                             f"{self._selection_count(self.selected_products, self.available_products)} selected"),
                 "Total Records": f"{len(self.current_results):,}",
                 "Generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "Generated By": "Advanced Search System v2.0"
@@ -1261,9 +2068,12 @@ class AdvancedSearchSystem(QDialog):
             self.status_bar.showMessage("Exporting to Excel...")
             QApplication.processEvents()
             
-            # Export to Excel
+            # Export the results on display in the table's sort order, so the
+            # file matches what the user sees and the counts reported below
+            # (a re-query could return different rows than the cached set)
+            order = self.results_table.results_model.source_rows()
             success = self.excel_exporter.export_search_results(
-                self.current_results, filename, metadata
+                self._iter_rows_in_order(self.current_results, order), filename, metadata
             )
             
             if success:
@@ -1289,36 +2099,27 @@ class AdvancedSearchSystem(QDialog):
     
     def keyPressEvent(self, event):
         """Handle keyboard shortcuts"""
-        try:
-            if event.key() == Qt.Key.Key_F5:
+        if event.key() == Qt.Key.Key_F5:
+            self._trigger_search()
+        elif event.key() == Qt.Key.Key_Escape:
+            self._clear_filters()
+        elif event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
+            if not self.search_button.text().startswith("🔄"):
                 self._trigger_search()
-            elif event.key() == Qt.Key.Key_Escape:
-                self._clear_filters()
-            elif event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
-                if not self.search_button.text().startswith("🔄"):
-                    self._trigger_search()
-            else:
-                super().keyPressEvent(event)
-                
-        except Exception as e:
-            logger.error("Error handling keyboard event: %s", e)
+        else:
+            super().keyPressEvent(event)
     
     def closeEvent(self, event):
         """Handle window close event"""
-        try:
-            # Close database connection
-            if self.database_connection:
-                self.database_connection.close()
-                logger.info("Database connection closed")
-            
-            # Stop any running timers
-            self.search_timer.stop()
-            
-            event.accept()
-            
-        except Exception as e:
-            logger.error("Error during close event: %s", e)
-            event.accept()
+        # Stop any running timers and wait for an in-flight search
+        self.search_timer.stop()
+        self.search_pool.waitForDone()
+        
+        # Close idle pooled connections
+        self.connection_pool.close_idle()
+        logger.info("Database connections closed")
+        
+        event.accept()
 
 
 def main():
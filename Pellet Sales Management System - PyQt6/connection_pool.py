@@ -0,0 +1,132 @@
+"""
+Shared MySQL Connection Pool
+
+Keeps a small set of open connections from conectar() for reuse across
+the application's modules:
+- Thread-safe checkout and return of live connections
+- Stale connections replaced transparently on checkout
+- Open transactions rolled back on return, so reads never see a stale snapshot
+- Server-side prepared statements cached per connection
+
+@author Daniel Jara
+@version 2.0.0
+@since Python 3.8+
+"""
+
+import queue
+import logging
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Tuple, Any
+
+from conexión import conectar
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable MySQL connections
+    
+    Connections come from conectar() and are handed back to the pool after
+    each use instead of being closed, so searches and lookups skip the
+    connect handshake. Stale connections are replaced on checkout.
+    
+    Server-side prepared statements live as long as their connection, so
+    the pool also keeps each connection's prepared cursors and closes them
+    together with it.
+    """
+    
+    # Prepared statements kept per connection; the oldest is closed first
+    _MAX_STATEMENTS = 32
+    
+    def __init__(self, size: int = 4):
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._statements: Dict[int, "OrderedDict[Tuple, Any]"] = {}
+    
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block"""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+    
+    def _acquire(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        
+        if conn is not None and not conn.is_connected():
+            self._discard(conn)
+            conn = None
+        
+        if conn is None:
+            conn = conectar()
+            if conn is None:
+                raise Exception("Could not establish database connection")
+        return conn
+    
+    def _release(self, conn):
+        # End the transaction opened by the borrower's reads; with autocommit
+        # off a parked connection would keep its REPEATABLE READ snapshot and
+        # the next borrower would never see newer sales
+        try:
+            conn.rollback()
+        except Exception as e:
+            logger.warning("Discarding pooled connection after failed rollback: %s", e)
+            self._discard(conn)
+            return
+        
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn)
+    
+    def _discard(self, conn):
+        """Close a connection along with its prepared statements"""
+        for cursor in self._statements.pop(id(conn), {}).values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    def prepared_cursor(self, conn, key: Tuple):
+        """
+        Prepared cursor for ``key`` on ``conn``, created on first use
+        
+        Re-executing a prepared cursor with the same SQL skips the server's
+        parse and plan step, so callers key it by the statement shape.
+        """
+        statements = self._statements.setdefault(id(conn), OrderedDict())
+        cursor = statements.get(key)
+        if cursor is not None:
+            statements.move_to_end(key)
+            return cursor
+        
+        if len(statements) >= self._MAX_STATEMENTS:
+            _, oldest = statements.popitem(last=False)
+            oldest.close()
+        cursor = conn.cursor(prepared=True)
+        statements[key] = cursor
+        return cursor
+    
+    def close_idle(self):
+        """Close every connection currently parked in the pool"""
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+            except Exception as e:
+                logger.warning("Error closing pooled connection: %s", e)
+
+
+# Pool shared by the search dialog, the data processor and the charts
+shared_pool = ConnectionPool()
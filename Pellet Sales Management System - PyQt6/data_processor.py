@@ -39,10 +39,12 @@ import numpy as np
 from decimal import Decimal, getcontext
 from datetime import datetime, timedelta, date
 from collections import defaultdict
-from typing import Dict, List, Tuple, Optional, Union
+from typing import Dict, List, Tuple, Optional, Union, Iterator, Any
 import mysql.connector
-from conexión import conectar
+from connection_pool import shared_pool
+import heapq
 import logging
+import time
 
 # Configure decimal precision for financial calculations
 getcontext().prec = 10
@@ -51,6 +53,15 @@ getcontext().prec = 10
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Decimal constants used by calculate_financial_metrics, built once
+_DEC_ZERO = Decimal('0')
+_DEC_ONE = Decimal('1')
+_DEC_IVA_DEFAULT = Decimal('1.19')
+_DEC_IVA_FACTOR = _DEC_IVA_DEFAULT - _DEC_ONE
+
+# Product categories loaded from the database, shared by every processor
+_PRODUCT_CATEGORIES_CACHE: Optional[Dict] = None
+
 
 class SalesDataProcessor:
     """
@@ -68,6 +79,50 @@ class SalesDataProcessor:
     between data processing and presentation layers.
     """
     
+    # (unit, sales type, category) for products missing from the catalog
+    _UNKNOWN_PRODUCT = ("units", "Unknown", None)
+    
+    # Category totals appended to product summaries: (label, category, unit)
+    _CATEGORY_TOTALS = (
+        ("Total Pellet", "Pellet", "bolsas"),
+        ("Total Vacam", "Vacam", "total")
+    )
+    _CATEGORY_TOTAL_KEYS = frozenset(label for label, _, _ in _CATEGORY_TOTALS)
+    
+    # Summary input columns renamed to common names, keyed by is_monthly
+    _SUMMARY_COLUMNS = {
+        False: {"total": "total_bruto"},
+        True: {"total_cantidad": "cantidad", "total_total": "total_bruto",
+               "total_kilos": "kilos"}
+    }
+    
+    # Product metrics copied into export records
+    _EXPORT_METRICS = ["cantidad", "unit", "toneladas", "total_neto",
+                       "total_bruto", "total_dolares"]
+    _EXPORT_COLUMNS = ["Producto", "Cantidad", "Unidad", "Toneladas", "Total_Neto_CLP",
+                       "Total_Bruto_CLP", "Total_USD", "Fecha_Proceso"]
+    
+    # Branch names as stored in VentasDiarias, mapped to result keys
+    _BRANCH_KEYS = {"Osorno": "osorno", "La Unión": "union"}
+    
+    # Branch totals per sales type, summed by the server; products whose
+    # sales type is neither Local nor Distribuidor are left out
+    _BRANCH_TOTALS_QUERY = """
+        SELECT v.PuntoVenta,
+               CASE p.tipo_venta
+                   WHEN 'Local' THEN 'Pellet (venta local)'
+                   WHEN 'Distribuidor' THEN 'Pellet (venta distribuidor)'
+               END AS product_key,
+               SUM(v.KilosTotales) AS total_kilos,
+               SUM(v.Unidad) AS total_cantidad, SUM(v.Total) AS total_total,
+               SUM(v.Neto) AS total_neto
+        FROM VentasDiarias v
+        JOIN Productos p ON p.Producto = v.Articulo
+        WHERE {condition}
+        GROUP BY v.PuntoVenta, product_key
+        HAVING product_key IS NOT NULL
+    """
+    
     def __init__(self, exchange_rate: float = 945.0):
         """
         Initialize the data processor with business configuration
@@ -76,17 +131,24 @@ class SalesDataProcessor:
             exchange_rate (float): USD to CLP exchange rate for currency conversion
         """
         self.exchange_rate = Decimal(str(exchange_rate))
+        self.exchange_rate_cents = int(round(exchange_rate * 100))  # CLP per USD, scaled x100
+        self._exchange_rate_float = float(exchange_rate)  # For float-valued USD figures (formatting, KPIs)
         self.data_cache = {}
         self.cache_timeout = 300  # 5 minutes cache timeout
-        self.last_cache_update = {}
+        self.last_cache_update = {}  # time.monotonic() of each cache write
+        self.cache_data_version = {}  # Data version each cache entry was built from
+        self._data_version = None
+        self._data_version_checked = 0.0
         
         # Business configuration
         self.business_start_date = date(2024, 4, 1)
-        self.ton_conversion_factor = Decimal('15')  # 15kg per bag to tons conversion
-        self.iva_rate = Decimal('1.19')  # Chilean IVA rate
+        self.ton_conversion_factor = 15  # 15kg per bag to tons conversion
+        self.iva_rate = (119, 100)  # Chilean IVA rate as an integer ratio
         
         # Product categorization
         self.product_categories = self._load_product_categories()
+        self._product_meta = self._build_product_meta(self.product_categories)
+        self._products_by_type: Dict[str, List[str]] = {}
         
         logger.info("SalesDataProcessor initialized with exchange rate: %s", exchange_rate)
     
@@ -97,32 +159,45 @@ class SalesDataProcessor:
         Returns:
             Dict: Product categorization mapping
         """
+        global _PRODUCT_CATEGORIES_CACHE
+        if _PRODUCT_CATEGORIES_CACHE is not None:
+            return _PRODUCT_CATEGORIES_CACHE
+        
         try:
-            conn = conectar()
-            if conn is None:
-                logger.warning("Database connection failed, using fallback categories")
-                return self._get_fallback_categories()
-            
-            cursor = conn.cursor(dictionary=True)
-            query = """
-                SELECT Producto, tipo_venta, empaque, tipo_producto 
-                FROM Productos 
-                ORDER BY ID
-            """
-            cursor.execute(query)
-            products = cursor.fetchall()
+            # Pooled connection; an unreachable server raises and falls back
+            with shared_pool.connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                try:
+                    cursor.execute("""
+                        SELECT Producto, tipo_venta, empaque, tipo_producto 
+                        FROM Productos 
+                        ORDER BY ID
+                    """)
+                    products = cursor.fetchall()
+                finally:
+                    cursor.close()
+            
+            # Build every mapping in a single pass over the rows
+            order, unit, pellet, vacam, sales_type = [], {}, [], [], {}
+            for p in products:
+                name = p['Producto']
+                order.append(name)
+                unit[name] = p['empaque']
+                sales_type[name] = p['tipo_venta']
+                if p['tipo_producto'] == 'Pellet':
+                    pellet.append(name)
+                elif p['tipo_producto'] == 'Vacam':
+                    vacam.append(name)
             
             categories = {
-                'PRODUCT_ORDER': [p['Producto'] for p in products],
-                'PRODUCT_UNIT': {p['Producto']: p['empaque'] for p in products},
-                'PELLET_PRODUCTS': [p['Producto'] for p in products if p['tipo_producto'] == 'Pellet'],
-                'VACAM_PRODUCTS': [p['Producto'] for p in products if p['tipo_producto'] == 'Vacam'],
-                'SALES_TYPE_MAP': {p['Producto']: p['tipo_venta'] for p in products}
+                'PRODUCT_ORDER': order,
+                'PRODUCT_UNIT': unit,
+                'PELLET_PRODUCTS': pellet,
+                'VACAM_PRODUCTS': vacam,
+                'SALES_TYPE_MAP': sales_type
             }
             
-            cursor.close()
-            conn.close()
-            
+            _PRODUCT_CATEGORIES_CACHE = categories
             logger.info("Loaded %d product categories from database", len(products))
             return categories
             
@@ -130,6 +205,25 @@ class SalesDataProcessor:
             logger.error("Error loading product categories: %s", e)
             return self._get_fallback_categories()
     
+    @staticmethod
+    def _build_product_meta(categories: Dict) -> Dict[str, Tuple[str, str, Optional[str]]]:
+        """Index every product as (unit, sales type, category) for single lookups"""
+        category_of = dict.fromkeys(categories['PELLET_PRODUCTS'], "Pellet")
+        category_of.update(dict.fromkeys(categories['VACAM_PRODUCTS'], "Vacam"))
+        units = categories['PRODUCT_UNIT']
+        sales_types = categories['SALES_TYPE_MAP']
+        return {
+            product: (units.get(product, "units"), sales_types.get(product, "Unknown"),
+                      category_of.get(product))
+            for product in categories['PRODUCT_ORDER']
+        }
+    
+    @classmethod
+    def invalidate_product_categories(cls):
+        """Drop the shared product categories so the next processor reloads them"""
+        global _PRODUCT_CATEGORIES_CACHE
+        _PRODUCT_CATEGORIES_CACHE = None
+    
     def _get_fallback_categories(self) -> Dict[str, Dict[str, str]]:
         """Fallback product categories for demo purposes"""
         return {
@@ -177,21 +271,14 @@ class SalesDataProcessor:
         try:
             # Build date condition
             if start_date == end_date:
-                query_condition = "Fecha = %s"
+                query_condition = "v.Fecha = %s"
                 query_params = (start_date,)
             else:
-                query_condition = "Fecha BETWEEN %s AND %s"
+                query_condition = "v.Fecha BETWEEN %s AND %s"
                 query_params = (start_date, end_date)
             
             # Execute query
-            query = f"""
-                SELECT PuntoVenta, Articulo, SUM(KilosTotales) AS total_kilos, 
-                       SUM(Unidad) AS total_cantidad, SUM(Total) AS total_total, 
-                       SUM(Neto) AS total_neto
-                FROM VentasDiarias
-                WHERE {query_condition}
-                GROUP BY PuntoVenta, Articulo
-            """
+            query = self._BRANCH_TOTALS_QUERY.format(condition=query_condition)
             
             raw_data = self._execute_query(query, query_params)
             
@@ -199,8 +286,7 @@ class SalesDataProcessor:
             processed_data = self._process_branch_sales_data(raw_data)
             
             # Cache the result
-            self.data_cache[cache_key] = processed_data
-            self.last_cache_update[cache_key] = datetime.now()
+            self._store_cache(cache_key, processed_data)
             
             logger.info("Processed branch sales data for %d records", len(raw_data))
             return processed_data
@@ -219,55 +305,10 @@ class SalesDataProcessor:
         Returns:
             Dict: Processed data organized by branch and sales type
         """
-        # Initialize data structures
-        osorno_data = {
-            "Pellet (venta local)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')},
-            "Pellet (venta distribuidor)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')}
-        }
-        
-        union_data = {
-            "Pellet (venta local)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')},
-            "Pellet (venta distribuidor)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')}
-        }
-        
-        # Process each record
-        for record in raw_data:
-            branch = record["PuntoVenta"]
-            product = record["Articulo"]
-            kilos = record["total_kilos"]
-            quantity = record["total_cantidad"]
-            total = Decimal(str(record["total_total"]))
-            neto = Decimal(str(record["total_neto"]))
-            
-            # Convert kilos to tons
-            tons = Decimal(str(kilos)) / Decimal('1000')
-            
-            # Determine sales type
-            sales_type = self._get_sales_type(product)
-            
-            if sales_type == "Local":
-                product_key = "Pellet (venta local)"
-            elif sales_type == "Distribuidor":
-                product_key = "Pellet (venta distribuidor)"
-            else:
-                continue  # Skip unknown products
-            
-            # Aggregate data by branch
-            if branch == "Osorno":
-                osorno_data[product_key]["cantidad"] += quantity
-                osorno_data[product_key]["toneladas"] += tons
-                osorno_data[product_key]["total_neto"] += neto
-                osorno_data[product_key]["total_bruto"] += total
-            elif branch == "La Unión":
-                union_data[product_key]["cantidad"] += quantity
-                union_data[product_key]["toneladas"] += tons
-                union_data[product_key]["total_neto"] += neto
-                union_data[product_key]["total_bruto"] += total
-        
-        return {
-            'osorno': osorno_data,
-            'union': union_data
-        }
+        # Aggregate by branch and sales type
+        branch_data = self._get_empty_branch_data()
+        self._aggregate_branch_rows(raw_data, branch_data)
+        return branch_data
     
     def get_monthly_sales_by_branch_data(self, start_date: date, end_date: date) -> Dict[str, Dict]:
         """
@@ -286,50 +327,21 @@ class SalesDataProcessor:
             return self.data_cache[cache_key]
         
         try:
-            # Calculate month range
-            start_month = start_date.month
-            start_year = start_date.year
-            end_month = end_date.month
-            end_year = end_date.year
-            
-            # Initialize aggregation structures
-            osorno_monthly = {
-                "Pellet (venta local)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')},
-                "Pellet (venta distribuidor)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')}
-            }
-            
-            union_monthly = {
-                "Pellet (venta local)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')},
-                "Pellet (venta distribuidor)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')}
-            }
-            
-            # Process each month in the range
-            current_year = start_year
-            for month in range(start_month, end_month + 1):
-                if current_year != end_year and month > 12:
-                    break
-                    
-                month_start = date(current_year, month, 1)
-                # Calculate last day of month
-                if month == 12:
-                    month_end = date(current_year + 1, 1, 1) - timedelta(days=1)
-                else:
-                    month_end = date(current_year, month + 1, 1) - timedelta(days=1)
-                
-                # Get monthly data
-                monthly_data = self._get_monthly_data(month_start, month_end)
-                
-                # Aggregate monthly data
-                self._aggregate_monthly_data(monthly_data, osorno_monthly, union_monthly)
+            # Whole months from the start month through the end month
+            month_start = start_date.replace(day=1)
+            if end_date.month == 12:
+                month_end = date(end_date.year + 1, 1, 1) - timedelta(days=1)
+            else:
+                month_end = date(end_date.year, end_date.month + 1, 1) - timedelta(days=1)
             
-            result = {
-                'osorno': osorno_monthly,
-                'union': union_monthly
-            }
+            # One query over the whole range; summing per month first
+            # gives the same totals
+            monthly_data = self._get_monthly_data(month_start, month_end)
+            result = self._get_empty_branch_data()
+            self._aggregate_monthly_data(monthly_data, result['osorno'], result['union'])
             
             # Cache result
-            self.data_cache[cache_key] = result
-            self.last_cache_update[cache_key] = datetime.now()
+            self._store_cache(cache_key, result)
             
             return result
             
@@ -338,47 +350,42 @@ class SalesDataProcessor:
             return self._get_empty_branch_data()
     
     def _get_monthly_data(self, month_start: date, month_end: date) -> List[Dict]:
-        """Get sales data for a specific month"""
-        query = """
-            SELECT PuntoVenta, Articulo, SUM(KilosTotales) AS total_kilos, 
-                   SUM(Unidad) AS total_cantidad, SUM(Total) AS total_total, 
-                   SUM(Neto) AS total_neto
-            FROM VentasDiarias
-            WHERE Fecha BETWEEN %s AND %s
-            GROUP BY PuntoVenta, Articulo
-        """
+        """Get branch totals for a range of whole months"""
+        query = self._BRANCH_TOTALS_QUERY.format(condition="v.Fecha BETWEEN %s AND %s")
         return self._execute_query(query, (month_start, month_end))
     
     def _aggregate_monthly_data(self, monthly_data: List[Dict], osorno_data: Dict, union_data: Dict):
         """Aggregate monthly data into branch structures"""
-        for record in monthly_data:
-            branch = record["PuntoVenta"]
-            product = record["Articulo"]
-            kilos = record["total_kilos"]
-            quantity = record["total_cantidad"]
-            total = Decimal(str(record["total_total"]))
-            neto = Decimal(str(record["total_neto"]))
-            
-            tons = Decimal(str(kilos)) / Decimal('1000')
-            sales_type = self._get_sales_type(product)
-            
-            if sales_type == "Local":
-                product_key = "Pellet (venta local)"
-            elif sales_type == "Distribuidor":
-                product_key = "Pellet (venta distribuidor)"
-            else:
-                continue
-            
-            if branch == "Osorno":
-                osorno_data[product_key]["cantidad"] += quantity
-                osorno_data[product_key]["toneladas"] += tons
-                osorno_data[product_key]["total_neto"] += neto
-                osorno_data[product_key]["total_bruto"] += total
-            elif branch == "La Unión":
-                union_data[product_key]["cantidad"] += quantity
-                union_data[product_key]["toneladas"] += tons
-                union_data[product_key]["total_neto"] += neto
-                union_data[product_key]["total_bruto"] += total
+        self._aggregate_branch_rows(monthly_data, {'osorno': osorno_data, 'union': union_data})
+    
+    def _aggregate_branch_rows(self, raw_data: List[Dict], branch_data: Dict[str, Dict]):
+        """
+        Add server-aggregated branch totals into per-branch structures
+        
+        Amounts are summed as integers (CLP has no minor units) and kilos as
+        exact Decimals; tons are derived from the kilo totals once all rows
+        are in.
+        
+        Args:
+            raw_data (List[Dict]): Rows from _BRANCH_TOTALS_QUERY, at most one
+                per branch and sales type
+            branch_data (Dict): {'osorno': {...}, 'union': {...}}, updated in place
+        """
+        branch_keys = self._BRANCH_KEYS
+        for record in raw_data:
+            branch_key = branch_keys.get(record["PuntoVenta"])
+            if branch_key is None:
+                continue  # Skip unknown branches
+            
+            entry = branch_data[branch_key][record["product_key"]]
+            entry["cantidad"] += int(record["total_cantidad"] or 0)
+            entry["kilos"] += Decimal(str(record["total_kilos"] or 0))
+            entry["total_neto"] += int(round(record["total_neto"] or 0))
+            entry["total_bruto"] += int(round(record["total_total"] or 0))
+        
+        for products in branch_data.values():
+            for entry in products.values():
+                entry["toneladas"] = Decimal(entry["kilos"]).scaleb(-3)
     
     def process_daily_sales_summary(self, raw_data: List[Dict]) -> Dict[str, Dict]:
         """
@@ -390,45 +397,7 @@ class SalesDataProcessor:
         Returns:
             Dict: Processed daily sales summary by product
         """
-        try:
-            summary = {}
-            
-            for record in raw_data:
-                product = record["producto"]
-                quantity = int(record["cantidad"])
-                total = Decimal(str(record["total"]))
-                kilos = record.get("kilos", quantity * 15)  # Default 15kg per unit
-                
-                # Get product unit from categories
-                unit = self.product_categories['PRODUCT_UNIT'].get(product, "units")
-                
-                if product not in summary:
-                    summary[product] = {
-                        "cantidad": 0, 
-                        "total_bruto": Decimal('0'), 
-                        "kilos": 0, 
-                        "unit": unit
-                    }
-                
-                summary[product]["cantidad"] += quantity
-                summary[product]["total_bruto"] += total
-                summary[product]["kilos"] += kilos
-            
-            # Calculate financial metrics for each product
-            for product, data in summary.items():
-                data["total_neto"] = data["total_bruto"] / self.iva_rate
-                data["total_dolares"] = data["total_bruto"] / self.exchange_rate
-                data["toneladas"] = Decimal(str(data["kilos"])) / Decimal('1000')
-            
-            # Add category totals
-            summary = self._add_category_totals(summary)
-            
-            logger.info("Processed daily sales summary for %d products", len(summary))
-            return summary
-            
-        except Exception as e:
-            logger.error("Error processing daily sales summary: %s", e)
-            return {}
+        return self._process_sales_summary(raw_data, is_monthly=False)
     
     def process_monthly_sales_summary(self, raw_data: List[Dict]) -> Dict[str, Dict]:
         """
@@ -440,85 +409,115 @@ class SalesDataProcessor:
         Returns:
             Dict: Processed monthly sales summary
         """
-        try:
-            summary = {}
+        return self._process_sales_summary(raw_data, is_monthly=True)
+    
+    def _process_sales_summary(self, raw_data: List[Dict], is_monthly: bool) -> Dict[str, Dict]:
+        """
+        Sum raw sales rows per product and append the category totals
+        
+        Daily and monthly rows differ only in their column names, which are
+        renamed once at the DataFrame boundary. One pandas groupby over int64
+        columns then replaces the per-row loop, and net amounts are computed
+        for all products in one vectorized step. Kilos are summed as whole
+        grams so fractional weights are kept exactly. Rows without kilos
+        default to 15kg per unit.
+        
+        Args:
+            raw_data (List[Dict]): Rows with a 'producto' column
+            is_monthly (bool): Whether the rows come from the monthly query
             
-            for record in raw_data:
-                product = record["producto"]
-                quantity = record["total_cantidad"]
-                total = Decimal(str(record["total_total"]))
-                kilos = Decimal(str(record.get("total_kilos", quantity * 15)))
-                
-                unit = self.product_categories['PRODUCT_UNIT'].get(product, "units")
-                
-                if product not in summary:
-                    summary[product] = {
-                        "cantidad": 0,
-                        "total_bruto": Decimal('0'),
-                        "kilos": Decimal('0'),
-                        "unit": unit
-                    }
-                
-                summary[product]["cantidad"] += quantity
-                summary[product]["total_bruto"] += total
-                summary[product]["kilos"] += kilos
+        Returns:
+            Dict: Per-product summary keyed by product name
+        """
+        period = "monthly" if is_monthly else "daily"
+        try:
+            if not raw_data:
+                return {}
             
-            # Calculate financial metrics
-            for product, data in summary.items():
-                data["total_neto"] = data["total_bruto"] / self.iva_rate
-                data["total_dolares"] = data["total_bruto"] / self.exchange_rate
-                data["toneladas"] = data["kilos"] / Decimal('1000')
+            df = pd.DataFrame.from_records(raw_data).rename(
+                columns=self._SUMMARY_COLUMNS[is_monthly]
+            )
+            quantity = pd.to_numeric(df["cantidad"], errors="coerce").fillna(0)
+            default_kilos = quantity * self.ton_conversion_factor
+            if "kilos" in df:
+                kilos = pd.to_numeric(df["kilos"], errors="coerce").fillna(default_kilos)
+            else:
+                kilos = default_kilos
+            
+            grouped = pd.DataFrame({
+                "cantidad": quantity.round().astype("int64"),
+                "total_bruto": pd.to_numeric(df["total_bruto"], errors="coerce").fillna(0).round().astype("int64"),
+                "gramos": (kilos * 1000).round().astype("int64"),
+            }).groupby(df["producto"], sort=False).sum()
+            
+            iva_numerator, iva_denominator = self.iva_rate
+            grouped["total_neto"] = grouped["total_bruto"] * iva_denominator // iva_numerator
+            usd_cents = grouped["total_bruto"] * 10000 // self.exchange_rate_cents
+            
+            summary = grouped.to_dict(orient="index")
+            product_meta = self._product_meta
+            unknown = self._UNKNOWN_PRODUCT
+            for product, cents in usd_cents.items():
+                data = summary[product]
+                grams = int(data.pop("gramos"))
+                data["unit"] = product_meta.get(product, unknown)[0]
+                data["total_dolares"] = Decimal(int(cents)).scaleb(-2)
+                data["kilos"] = Decimal(grams).scaleb(-3)
+                data["toneladas"] = Decimal(grams).scaleb(-6)
             
             # Add category totals
             summary = self._add_category_totals(summary)
             
+            logger.info("Processed %s sales summary for %d products", period, len(summary))
             return summary
             
         except Exception as e:
-            logger.error("Error processing monthly sales summary: %s", e)
+            logger.error("Error processing %s sales summary: %s", period, e)
             return {}
     
+    def _set_financial_metrics(self, data: Dict):
+        """
+        Derive net, USD and ton figures from integer CLP and kilo totals
+        
+        CLP arithmetic stays in integers (CLP has no minor units); the USD
+        amount is turned into a Decimal from whole cents, and tons are the
+        exact Decimal kilo total scaled down.
+        """
+        iva_numerator, iva_denominator = self.iva_rate
+        gross = data["total_bruto"]
+        data["total_neto"] = gross * iva_denominator // iva_numerator
+        data["total_dolares"] = Decimal(gross * 10000 // self.exchange_rate_cents).scaleb(-2)
+        data["toneladas"] = Decimal(data["kilos"]).scaleb(-3)
+    
     def _add_category_totals(self, summary: Dict[str, Dict]) -> Dict[str, Dict]:
         """Add category totals (Pellet, Vacam) to summary"""
-        # Calculate Pellet totals
-        pellet_total = {
-            "cantidad": 0,
-            "total_bruto": Decimal('0'),
-            "kilos": Decimal('0'),
-            "unit": "bolsas"
-        }
-        
-        for product in self.product_categories['PELLET_PRODUCTS']:
-            if product in summary:
-                pellet_total["cantidad"] += summary[product]["cantidad"]
-                pellet_total["total_bruto"] += summary[product]["total_bruto"]
-                pellet_total["kilos"] += Decimal(str(summary[product]["kilos"]))
-        
-        if pellet_total["cantidad"] > 0:
-            pellet_total["total_neto"] = pellet_total["total_bruto"] / self.iva_rate
-            pellet_total["total_dolares"] = pellet_total["total_bruto"] / self.exchange_rate
-            pellet_total["toneladas"] = pellet_total["kilos"] / Decimal('1000')
-            summary["Total Pellet"] = pellet_total
-        
-        # Calculate Vacam totals
-        vacam_total = {
-            "cantidad": 0,
-            "total_bruto": Decimal('0'),
-            "kilos": Decimal('0'),
-            "unit": "total"
-        }
+        if not summary:
+            return summary
         
-        for product in self.product_categories['VACAM_PRODUCTS']:
-            if product in summary:
-                vacam_total["cantidad"] += summary[product]["cantidad"]
-                vacam_total["total_bruto"] += summary[product]["total_bruto"]
-                vacam_total["kilos"] += Decimal(str(summary[product]["kilos"]))
+        # Bucket the summary's products by category in one pass
+        members = {category: [] for _, category, _ in self._CATEGORY_TOTALS}
+        product_meta = self._product_meta
+        unknown = self._UNKNOWN_PRODUCT
+        for product, data in summary.items():
+            bucket = members.get(product_meta.get(product, unknown)[2])
+            if bucket is not None:
+                bucket.append(data)
         
-        if vacam_total["cantidad"] > 0:
-            vacam_total["total_neto"] = vacam_total["total_bruto"] / self.iva_rate
-            vacam_total["total_dolares"] = vacam_total["total_bruto"] / self.exchange_rate
-            vacam_total["toneladas"] = vacam_total["kilos"] / Decimal('1000')
-            summary["Total Vacam"] = vacam_total
+        for label, category, unit in self._CATEGORY_TOTALS:
+            products = members[category]
+            if not products:
+                continue  # No products of this category in the summary
+            
+            category_total = {
+                "cantidad": sum(data["cantidad"] for data in products),
+                "total_bruto": sum(data["total_bruto"] for data in products),
+                "kilos": sum(data["kilos"] for data in products),
+                "unit": unit
+            }
+            
+            if category_total["cantidad"] > 0:
+                self._set_financial_metrics(category_total)
+                summary[label] = category_total
         
         return summary
     
@@ -535,19 +534,9 @@ class SalesDataProcessor:
         try:
             metrics = {}
             
-            osorno_data = branch_data.get('osorno', {})
-            union_data = branch_data.get('union', {})
-            
-            # Calculate total sales by branch
-            osorno_total = sum(
-                float(data.get('total_bruto', 0)) 
-                for data in osorno_data.values()
-            )
-            
-            union_total = sum(
-                float(data.get('total_bruto', 0)) 
-                for data in union_data.values()
-            )
+            # Calculate total sales and volume by branch
+            osorno_total, osorno_tons = self._branch_totals(branch_data.get('osorno', {}))
+            union_total, union_tons = self._branch_totals(branch_data.get('union', {}))
             
             # Performance ratios
             total_sales = osorno_total + union_total
@@ -558,16 +547,6 @@ class SalesDataProcessor:
                 metrics['performance_ratio'] = osorno_total / union_total if union_total > 0 else float('inf')
             
             # Volume metrics
-            osorno_tons = sum(
-                float(data.get('toneladas', 0)) 
-                for data in osorno_data.values()
-            )
-            
-            union_tons = sum(
-                float(data.get('toneladas', 0)) 
-                for data in union_data.values()
-            )
-            
             metrics['osorno_volume'] = osorno_tons
             metrics['union_volume'] = union_tons
             metrics['total_volume'] = osorno_tons + union_tons
@@ -585,6 +564,12 @@ class SalesDataProcessor:
             logger.error("Error calculating performance metrics: %s", e)
             return {}
     
+    def _branch_totals(self, products: Dict[str, Dict]) -> Tuple[float, float]:
+        """Gross sales and tons for one branch, summed exactly and converted once"""
+        gross = sum(data.get('total_bruto', 0) for data in products.values())
+        kilos = sum(data.get('kilos', 0) for data in products.values())
+        return float(gross), float(kilos) / 1000
+    
     def get_trend_analysis(self, data: List[float], periods: int = 5) -> Dict[str, Union[str, List[float]]]:
         """
         Perform trend analysis on sales data
@@ -600,9 +585,22 @@ class SalesDataProcessor:
             if len(data) < 3:
                 return {"trend": "insufficient_data", "forecast": []}
             
-            # Calculate trend direction
-            x = np.arange(len(data))
-            slope, intercept = np.polyfit(x, data, 1)
+            # Least-squares trend line in closed form; the centered arrays
+            # also give R-squared and volatility without further passes
+            values = np.asarray(data, dtype=np.float64)
+            n = len(values)
+            x = np.arange(n, dtype=np.float64)
+            x_mean = (n - 1) / 2
+            x_centered = x - x_mean
+            y_mean = values.mean()
+            y_centered = values - y_mean
+            slope = (x_centered @ y_centered) / (x_centered @ x_centered)
+            intercept = y_mean - slope * x_mean
+            
+            ss_tot = y_centered @ y_centered
+            residuals = values - (slope * x + intercept)
+            ss_res = residuals @ residuals
+            r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
             
             trend_threshold = 0.1
             if slope > trend_threshold:
@@ -613,15 +611,15 @@ class SalesDataProcessor:
                 trend = "stable"
             
             # Generate forecast
-            forecast_x = np.arange(len(data), len(data) + periods)
+            forecast_x = np.arange(n, n + periods)
             forecast = (slope * forecast_x + intercept).tolist()
             
             # Calculate moving averages
             moving_avg_7 = self._calculate_moving_average(data, 7)
             moving_avg_30 = self._calculate_moving_average(data, 30)
             
-            # Calculate volatility
-            volatility = np.std(data) if len(data) > 1 else 0
+            # Calculate volatility (population standard deviation)
+            volatility = np.sqrt(ss_tot / n)
             
             return {
                 "trend": trend,
@@ -630,7 +628,7 @@ class SalesDataProcessor:
                 "moving_avg_7": moving_avg_7,
                 "moving_avg_30": moving_avg_30,
                 "volatility": float(volatility),
-                "r_squared": self._calculate_r_squared(data, slope, intercept)
+                "r_squared": float(r_squared)
             }
             
         except Exception as e:
@@ -642,30 +640,13 @@ class SalesDataProcessor:
         if len(data) < window:
             return data
         
-        moving_avg = []
-        for i in range(len(data)):
-            if i < window - 1:
-                moving_avg.append(np.mean(data[:i+1]))
-            else:
-                moving_avg.append(np.mean(data[i-window+1:i+1]))
+        # Running sums give every window mean from one cumulative pass; the
+        # first window - 1 points average over the data seen so far
+        sums = np.concatenate(([0.0], np.cumsum(np.asarray(data, dtype=np.float64))))
+        warmup = sums[1:window] / np.arange(1, window)
+        steady = (sums[window:] - sums[:-window]) / window
         
-        return moving_avg
-    
-    def _calculate_r_squared(self, data: List[float], slope: float, intercept: float) -> float:
-        """Calculate R-squared for trend line fit"""
-        try:
-            x = np.arange(len(data))
-            y_pred = slope * x + intercept
-            y_mean = np.mean(data)
-            
-            ss_tot = np.sum((data - y_mean) ** 2)
-            ss_res = np.sum((data - y_pred) ** 2)
-            
-            r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
-            return float(r_squared)
-            
-        except Exception:
-            return 0.0
+        return np.concatenate((warmup, steady)).tolist()
     
     def format_currency(self, amount: Union[Decimal, float, int]) -> str:
         """
@@ -678,9 +659,10 @@ class SalesDataProcessor:
             str: Formatted currency string
         """
         try:
-            if isinstance(amount, (Decimal, float, int)):
-                amount_decimal = Decimal(str(amount))
-                return f"${amount_decimal:,.0f}"
+            if isinstance(amount, int):
+                return f"${amount:,}"
+            if isinstance(amount, (Decimal, float)):
+                return f"${amount:,.0f}"
             return "Invalid amount"
             
         except Exception as e:
@@ -699,8 +681,7 @@ class SalesDataProcessor:
         """
         try:
             if isinstance(amount, (Decimal, float, int)):
-                amount_decimal = Decimal(str(amount))
-                usd_amount = amount_decimal / self.exchange_rate
+                usd_amount = float(amount) / self._exchange_rate_float
                 return f"${usd_amount:,.2f}"
             return "Invalid amount"
             
@@ -710,33 +691,32 @@ class SalesDataProcessor:
     
     def _get_sales_type(self, product: str) -> str:
         """Get sales type for a product"""
-        return self.product_categories['SALES_TYPE_MAP'].get(product, "Unknown")
+        return self._product_meta.get(product, self._UNKNOWN_PRODUCT)[1]
     
-    def _execute_query(self, query: str, params: Tuple = ()) -> List[Dict]:
+    def _execute_query(self, query: str, params: Tuple = (),
+                       stream: bool = False) -> Union[List[Dict], Iterator[Dict]]:
         """
         Execute database query with error handling
         
         Args:
             query (str): SQL query to execute
             params (Tuple): Query parameters
+            stream (bool): Yield rows as they arrive instead of returning a list
             
         Returns:
-            List[Dict]: Query results
+            Union[List[Dict], Iterator[Dict]]: Query results
         """
+        if stream:
+            return self._iter_query(query, params)
+        
         try:
-            conn = conectar()
-            if conn is None:
-                logger.error("Database connection failed")
-                return []
-            
-            cursor = conn.cursor(dictionary=True)
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            
-            cursor.close()
-            conn.close()
-            
-            return results
+            # Pooled connection and a prepared statement per query text, so
+            # repeated reports skip the connect handshake and the re-parse
+            with shared_pool.connection() as conn:
+                cursor = shared_pool.prepared_cursor(conn, (query,))
+                cursor.execute(query, params)
+                columns = cursor.column_names
+                return [dict(zip(columns, row)) for row in cursor.fetchall()]
             
         except mysql.connector.Error as e:
             logger.error("Database error executing query: %s", e)
@@ -745,36 +725,97 @@ class SalesDataProcessor:
             logger.error("Unexpected error executing query: %s", e)
             return []
     
+    def _iter_query(self, query: str, params: Tuple = (), chunk: int = 1000) -> Iterator[Dict]:
+        """
+        Stream query results from an unbuffered cursor
+        
+        Rows are fetched ``chunk`` at a time, so detail queries never hold
+        the full result set in memory. Errors are logged and end the stream.
+        """
+        try:
+            with shared_pool.connection() as conn:
+                cursor = conn.cursor(dictionary=True, buffered=False)
+                try:
+                    cursor.execute(query, params)
+                    while True:
+                        rows = cursor.fetchmany(chunk)
+                        if not rows:
+                            break
+                        yield from rows
+                finally:
+                    # Drain rows left behind if the consumer stopped early
+                    if conn.unread_result:
+                        conn.consume_results()
+                    cursor.close()
+                
+        except mysql.connector.Error as e:
+            logger.error("Database error streaming query: %s", e)
+        except Exception as e:
+            logger.error("Unexpected error streaming query: %s", e)
+    
+    def _current_data_version(self) -> Optional[int]:
+        """
+        Latest VentaID in VentasDiarias, probed at most once per second
+        
+        New sales raise the version, which invalidates every cache entry
+        built before them. The probe relies on the shared pool ending each
+        borrower's transaction; a pooled connection still holding its first
+        read snapshot would report the same maximum indefinitely.
+        Returns None if the probe fails.
+        """
+        now = time.monotonic()
+        if now - self._data_version_checked >= 1.0:
+            rows = self._execute_query("SELECT MAX(VentaID) AS version FROM VentasDiarias")
+            self._data_version = rows[0]["version"] if rows else None
+            self._data_version_checked = now
+        return self._data_version
+    
+    def _store_cache(self, cache_key: str, value: Dict):
+        """Cache a result together with the data version it was built from"""
+        self.data_cache[cache_key] = value
+        self.last_cache_update[cache_key] = time.monotonic()
+        self.cache_data_version[cache_key] = self._current_data_version()
+    
     def _is_cache_valid(self, cache_key: str) -> bool:
-        """Check if cached data is still valid"""
+        """
+        Check if cached data is still valid
+        
+        Entries are dropped as soon as new sales are recorded; the timeout
+        remains as a backstop for edits to existing rows, which the
+        version probe cannot see.
+        """
         if cache_key not in self.data_cache:
             return False
         
         if cache_key not in self.last_cache_update:
             return False
         
-        time_elapsed = (datetime.now() - self.last_cache_update[cache_key]).seconds
-        return time_elapsed < self.cache_timeout
+        version = self.cache_data_version.get(cache_key)
+        if version is None or version != self._current_data_version():
+            return False
+        
+        return time.monotonic() - self.last_cache_update[cache_key] < self.cache_timeout
     
     def _get_empty_branch_data(self) -> Dict[str, Dict]:
-        """Return empty branch data structure"""
-        empty_structure = {
-            "Pellet (venta local)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')},
-            "Pellet (venta distribuidor)": {"cantidad": 0, "toneladas": 0, "total_neto": Decimal('0'), "total_bruto": Decimal('0')}
-        }
-        
+        """Return empty branch data structure with integer CLP and kilo totals"""
         return {
-            'osorno': empty_structure.copy(),
-            'union': empty_structure.copy()
+            branch_key: {
+                product_key: {"cantidad": 0, "kilos": 0, "toneladas": 0,
+                              "total_neto": 0, "total_bruto": 0}
+                for product_key in ("Pellet (venta local)", "Pellet (venta distribuidor)")
+            }
+            for branch_key in ('osorno', 'union')
         }
     
     def clear_cache(self):
         """Clear all cached data"""
         self.data_cache.clear()
         self.last_cache_update.clear()
+        self.cache_data_version.clear()
+        self._products_by_type.clear()
         logger.info("Data cache cleared")
     
-def update_exchange_rate(self, new_rate: float):
+    def update_exchange_rate(self, new_rate: float):
         """
         Update exchange rate and clear related cache
         
@@ -782,6 +823,8 @@ def update_exchange_rate(self, new_rate: float):
             new_rate (float): New exchange rate
         """
         self.exchange_rate = Decimal(str(new_rate))
+        self.exchange_rate_cents = int(round(new_rate * 100))
+        self._exchange_rate_float = float(new_rate)
         # Clear cache to force recalculation with new rate
         self.clear_cache()
         logger.info("Exchange rate updated to: %s", new_rate)
@@ -797,22 +840,17 @@ def update_exchange_rate(self, new_rate: float):
             List[str]: List of products for the specified sales type
         """
         try:
-            conn = conectar()
-            if conn is None:
-                logger.warning("Database connection failed for products query")
-                return []
+            products = self._products_by_type.get(sales_type)
+            if products is not None:
+                return list(products)
             
-            cursor = conn.cursor(dictionary=True)
-            query = "SELECT Producto FROM Productos WHERE tipo_venta = %s"
-            cursor.execute(query, (sales_type,))
-            
-            products = [row['Producto'] for row in cursor.fetchall()]
-            
-            cursor.close()
-            conn.close()
+            # Answered from the loaded categories rather than a new query
+            products = [product for product, meta in self._product_meta.items()
+                        if meta[1] == sales_type]
+            self._products_by_type[sales_type] = products
             
             logger.info("Retrieved %d products for sales type: %s", len(products), sales_type)
-            return products
+            return list(products)
             
         except Exception as e:
             logger.error("Error retrieving products by sales type: %s", e)
@@ -837,38 +875,48 @@ def update_exchange_rate(self, new_rate: float):
         
         try:
             required_fields = ["PuntoVenta", "Articulo", "total_cantidad", "total_total"]
-            
-            for i, record in enumerate(data):
-                # Check required fields
-                for field in required_fields:
-                    if field not in record or record[field] is None:
-                        validation_report["issues"].append(
-                            f"Record {i}: Missing required field '{field}'"
-                        )
-                        validation_report["is_valid"] = False
-                
-                # Validate numeric fields
-                numeric_fields = ["total_cantidad", "total_total", "total_neto"]
-                for field in numeric_fields:
-                    if field in record:
-                        try:
-                            float(record[field])
-                        except (ValueError, TypeError):
-                            validation_report["issues"].append(
-                                f"Record {i}: Invalid numeric value in field '{field}'"
-                            )
-                            validation_report["is_valid"] = False
+            numeric_fields = ["total_cantidad", "total_total", "total_neto"]
+            
+            # Column-wise checks; messages are only built for the records
+            # that fail, then ordered by record as they are reported
+            absent = object()
+            columns = {field: pd.Series([record.get(field, absent) for record in data], dtype=object)
+                       for field in dict.fromkeys(required_fields + numeric_fields)}
+            issues = []
+            warnings = []
+            
+            for order, field in enumerate(required_fields):
+                values = columns[field]
+                missing = values.map(lambda value: value is None or value is absent)
+                issues.extend((i, order, f"Record {i}: Missing required field '{field}'")
+                              for i in np.flatnonzero(missing.to_numpy(dtype=bool)))
+            
+            numeric = {}
+            for order, field in enumerate(numeric_fields, start=len(required_fields)):
+                values = columns[field]
+                present = values.map(lambda value: value is not absent).to_numpy(dtype=bool)
+                numeric[field] = pd.to_numeric(values.where(present), errors="coerce")
                 
-                # Check for negative values (warnings)
-                if record.get("total_cantidad", 0) < 0:
-                    validation_report["warnings"].append(
-                        f"Record {i}: Negative quantity detected"
-                    )
-                
-                if record.get("total_total", 0) < 0:
-                    validation_report["warnings"].append(
-                        f"Record {i}: Negative total amount detected"
-                    )
+                # Anything to_numeric could not parse is re-checked with float(),
+                # which accepts NaN and "nan"; a None in a required field was
+                # already reported as missing
+                candidates = np.flatnonzero(numeric[field].isna().to_numpy() & present)
+                skip_none = field in required_fields
+                issues.extend((i, order, f"Record {i}: Invalid numeric value in field '{field}'")
+                              for i in candidates
+                              if not (skip_none and values.iat[i] is None)
+                              and not self._is_float(values.iat[i]))
+            
+            # Check for negative values (warnings)
+            for order, (field, label) in enumerate((("total_cantidad", "quantity"),
+                                                    ("total_total", "total amount"))):
+                if field in numeric:
+                    warnings.extend((i, order, f"Record {i}: Negative {label} detected")
+                                    for i in np.flatnonzero((numeric[field] < 0).to_numpy()))
+            
+            validation_report["issues"] = [message for _, _, message in sorted(issues)]
+            validation_report["warnings"] = [message for _, _, message in sorted(warnings)]
+            validation_report["is_valid"] = not issues
             
             logger.info("Data validation completed: %s valid, %d issues, %d warnings", 
                        validation_report["is_valid"], 
@@ -886,6 +934,15 @@ def update_exchange_rate(self, new_rate: float):
                 "record_count": 0
             }
     
+    @staticmethod
+    def _is_float(value: Any) -> bool:
+        """Whether float() accepts a value"""
+        try:
+            float(value)
+            return True
+        except (ValueError, TypeError):
+            return False
+    
     def calculate_kpi_metrics(self, data: Dict[str, Dict]) -> Dict[str, float]:
         """
         Calculate Key Performance Indicators for business analysis
@@ -897,77 +954,177 @@ def update_exchange_rate(self, new_rate: float):
             Dict: KPI metrics
         """
         try:
-            kpis = {}
-            
-            # Total revenue
-            total_revenue = Decimal('0')
-            total_units = 0
-            total_tons = Decimal('0')
-            
-            for product, metrics in data.items():
-                if isinstance(metrics, dict) and 'total_bruto' in metrics:
-                    total_revenue += metrics.get('total_bruto', Decimal('0'))
-                    total_units += metrics.get('cantidad', 0)
-                    total_tons += metrics.get('toneladas', Decimal('0'))
-            
-            kpis['total_revenue_clp'] = float(total_revenue)
-            kpis['total_revenue_usd'] = float(total_revenue / self.exchange_rate)
-            kpis['total_units_sold'] = total_units
-            kpis['total_tons_sold'] = float(total_tons)
-            
-            # Average metrics
-            if total_units > 0:
-                kpis['average_revenue_per_unit'] = float(total_revenue / total_units)
-            if total_tons > 0:
-                kpis['average_revenue_per_ton'] = float(total_revenue / total_tons)
-            
-            # Product diversity
-            kpis['active_products'] = len([k for k, v in data.items() 
-                                         if isinstance(v, dict) and v.get('cantidad', 0) > 0])
-            
-            logger.info("Calculated KPI metrics: %d indicators", len(kpis))
+            kpis = self._kpis_from_scan(self._scan_products(data))
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Calculated KPI metrics: %d indicators", len(kpis))
             return kpis
             
         except Exception as e:
             logger.error("Error calculating KPI metrics: %s", e)
             return {}
     
-    def export_data_to_dict(self, data: Dict[str, Dict]) -> List[Dict[str, Union[str, float, int]]]:
+    def _scan_products(self, data: Dict[str, Dict]) -> Dict:
         """
-        Convert processed data to export-friendly dictionary format
+        Walk a sales summary once, collecting what both the KPIs and the
+        business insights are built from
+        
+        Revenue, units and kilos are summed over every row that carries
+        amounts; the leaders, revenue and alerts used for insights skip the
+        category total rows. The leaders are kept in size-3 min-heaps; the
+        negated position makes earlier products win ties, as a stable
+        descending sort would.
         
         Args:
             data (Dict): Processed sales data
             
         Returns:
-            List[Dict]: Export-ready data structure
+            Dict: Running totals, leader heaps and alerts
         """
-        try:
-            export_data = []
+        # Amounts are integers and kilos exact Decimals, so the KPI sums
+        # need no per-row conversion and are turned into floats once
+        total_revenue = 0
+        total_units = 0
+        total_kilos = 0
+        active_products = 0
+        
+        product_count = 0
+        product_revenue = 0.0
+        revenue_heap = []
+        volume_heap = []
+        alerts = []
+        
+        category_totals = self._CATEGORY_TOTAL_KEYS
+        for product, metrics in data.items():
+            if not isinstance(metrics, dict):
+                continue
             
-            for product, metrics in data.items():
-                if not isinstance(metrics, dict):
-                    continue
-                
-                export_record = {
-                    'Producto': product,
-                    'Cantidad': metrics.get('cantidad', 0),
-                    'Unidad': metrics.get('unit', ''),
-                    'Toneladas': float(metrics.get('toneladas', 0)),
-                    'Total_Neto_CLP': float(metrics.get('total_neto', 0)),
-                    'Total_Bruto_CLP': float(metrics.get('total_bruto', 0)),
-                    'Total_USD': float(metrics.get('total_dolares', 0)),
-                    'Fecha_Proceso': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
-                export_data.append(export_record)
+            # One lookup per metric; a missing amount marks a row that
+            # carries no amounts and is left out of the KPI sums
+            cantidad = metrics.get('cantidad', 0)
+            total_bruto = metrics.get('total_bruto')
+            if total_bruto is None:
+                total_bruto = 0
+            else:
+                total_revenue += total_bruto
+                total_units += cantidad
+                total_kilos += metrics.get('kilos', 0)
+            if cantidad > 0:
+                active_products += 1
+            
+            # Category totals are not products
+            if product in category_totals:
+                continue
             
-            logger.info("Prepared %d records for export", len(export_data))
-            return export_data
+            product_revenue += float(total_bruto)
+            for heap, value in ((revenue_heap, total_bruto), (volume_heap, cantidad)):
+                entry = (value, -product_count, product)
+                if len(heap) < 3:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heappushpop(heap, entry)
+            product_count += 1
+            
+            if cantidad == 0:
+                alerts.append(f"No sales recorded for {product}")
+            elif total_bruto < 0:
+                alerts.append(f"Negative revenue detected for {product}")
+        
+        return {
+            'total_revenue': float(total_revenue),
+            'total_units': total_units,
+            'total_kilos': total_kilos,
+            'active_products': active_products,
+            'product_count': product_count,
+            'product_revenue': product_revenue,
+            'revenue_heap': revenue_heap,
+            'volume_heap': volume_heap,
+            'alerts': alerts
+        }
+    
+    def _kpis_from_scan(self, scan: Dict) -> Dict[str, float]:
+        """
+        Build the KPI metrics from a product scan
+        
+        Args:
+            scan (Dict): Result of _scan_products
+            
+        Returns:
+            Dict: KPI metrics
+        """
+        kpis = {}
+        total_revenue = scan['total_revenue']
+        total_units = scan['total_units']
+        total_tons = float(scan['total_kilos']) / 1000
+        
+        kpis['total_revenue_clp'] = total_revenue
+        kpis['total_revenue_usd'] = total_revenue / self._exchange_rate_float
+        kpis['total_units_sold'] = total_units
+        kpis['total_tons_sold'] = total_tons
+        
+        # Average metrics
+        if total_units > 0:
+            kpis['average_revenue_per_unit'] = total_revenue / total_units
+        if total_tons > 0:
+            kpis['average_revenue_per_ton'] = total_revenue / total_tons
+        
+        # Product diversity
+        kpis['active_products'] = scan['active_products']
+        
+        return kpis
+    
+    def export_data_frame(self, data: Dict[str, Dict]) -> pd.DataFrame:
+        """
+        Convert processed data to an export-ready DataFrame
+        
+        Args:
+            data (Dict): Processed sales data
+            
+        Returns:
+            pd.DataFrame: One row per product, in export column order
+        """
+        try:
+            # Every record shares one processing timestamp
+            process_timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            products = [product for product, metrics in data.items() if isinstance(metrics, dict)]
+            
+            # One column-wise pass instead of a dict and four float() calls
+            # per product; missing metrics become 0 (or '' for the unit)
+            metrics = pd.DataFrame.from_records([data[product] for product in products],
+                                                columns=self._EXPORT_METRICS)
+            export_frame = pd.DataFrame({
+                'Producto': products,
+                'Cantidad': metrics['cantidad'].fillna(0),
+                'Unidad': metrics['unit'].fillna(''),
+                'Toneladas': metrics['toneladas'].fillna(0).astype(float),
+                'Total_Neto_CLP': metrics['total_neto'].fillna(0).astype(float),
+                'Total_Bruto_CLP': metrics['total_bruto'].fillna(0).astype(float),
+                'Total_USD': metrics['total_dolares'].fillna(0).astype(float)
+            })
+            export_frame['Fecha_Proceso'] = process_timestamp
+            
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Prepared %d records for export", len(export_frame))
+            return export_frame
             
         except Exception as e:
             logger.error("Error preparing export data: %s", e)
-            return []
+            return pd.DataFrame(columns=self._EXPORT_COLUMNS)
+    
+    def export_data_to_dict(self, data: Dict[str, Dict]) -> List[Dict[str, Union[str, float, int]]]:
+        """
+        Convert processed data to export-friendly dictionary format
+        
+        Prefer export_data_frame where a DataFrame can be consumed directly;
+        this builds one dict per record from it.
+        
+        Args:
+            data (Dict): Processed sales data
+            
+        Returns:
+            List[Dict]: Export-ready data structure
+        """
+        return self.export_data_frame(data).to_dict('records')
     
     def get_business_insights(self, data: Dict[str, Dict]) -> Dict[str, Union[str, float, List[str]]]:
         """
@@ -980,50 +1137,11 @@ def update_exchange_rate(self, new_rate: float):
             Dict: Business insights and recommendations
         """
         try:
-            insights = {
-                'top_products': [],
-                'revenue_leaders': [],
-                'volume_leaders': [],
-                'recommendations': [],
-                'alerts': []
-            }
-            
-            # Filter valid products (exclude totals)
-            valid_products = {k: v for k, v in data.items() 
-                            if isinstance(v, dict) and not k.startswith('Total')}
-            
-            if not valid_products:
-                return insights
-            
-            # Top products by revenue
-            revenue_sorted = sorted(valid_products.items(), 
-                                  key=lambda x: x[1].get('total_bruto', 0), 
-                                  reverse=True)
-            insights['revenue_leaders'] = [product for product, _ in revenue_sorted[:3]]
-            
-            # Top products by volume
-            volume_sorted = sorted(valid_products.items(), 
-                                 key=lambda x: x[1].get('cantidad', 0), 
-                                 reverse=True)
-            insights['volume_leaders'] = [product for product, _ in volume_sorted[:3]]
+            insights = self._insights_from_scan(self._scan_products(data))
             
-            # Business recommendations
-            total_revenue = sum(float(v.get('total_bruto', 0)) for v in valid_products.values())
-            
-            if total_revenue > 1000000:  # > 1M CLP
-                insights['recommendations'].append("Strong sales performance - consider expanding inventory")
-            elif total_revenue < 100000:  # < 100K CLP
-                insights['recommendations'].append("Low sales volume - review pricing and marketing strategies")
-            
-            # Alerts for unusual patterns
-            for product, metrics in valid_products.items():
-                if metrics.get('cantidad', 0) == 0:
-                    insights['alerts'].append(f"No sales recorded for {product}")
-                elif metrics.get('total_bruto', 0) < 0:
-                    insights['alerts'].append(f"Negative revenue detected for {product}")
-            
-            logger.info("Generated business insights with %d recommendations and %d alerts", 
-                       len(insights['recommendations']), len(insights['alerts']))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Generated business insights with %d recommendations and %d alerts", 
+                           len(insights['recommendations']), len(insights['alerts']))
             
             return insights
             
@@ -1037,13 +1155,83 @@ def update_exchange_rate(self, new_rate: float):
                 'alerts': []
             }
     
+    def _insights_from_scan(self, scan: Dict) -> Dict[str, Union[str, float, List[str]]]:
+        """
+        Build the business insights from a product scan
+        
+        Args:
+            scan (Dict): Result of _scan_products
+            
+        Returns:
+            Dict: Business insights and recommendations
+        """
+        insights = {
+            'top_products': [],
+            'revenue_leaders': [],
+            'volume_leaders': [],
+            'recommendations': [],
+            'alerts': []
+        }
+        
+        if not scan['product_count']:
+            return insights
+        
+        insights['revenue_leaders'] = [product for _, _, product in sorted(scan['revenue_heap'], reverse=True)]
+        insights['volume_leaders'] = [product for _, _, product in sorted(scan['volume_heap'], reverse=True)]
+        insights['alerts'] = scan['alerts']
+        
+        # Business recommendations
+        total_revenue = scan['product_revenue']
+        if total_revenue > 1000000:  # > 1M CLP
+            insights['recommendations'].append("Strong sales performance - consider expanding inventory")
+        elif total_revenue < 100000:  # < 100K CLP
+            insights['recommendations'].append("Low sales volume - review pricing and marketing strategies")
+        
+        return insights
+    
+    def _scan_once(self, data: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Compute KPIs, validation and insights for one sales summary with a
+        single pass over its products
+        
+        Args:
+            data (Dict): Processed sales data
+            
+        Returns:
+            Dict: 'kpi', 'validation' and 'insights' for the summary
+        """
+        scan = self._scan_products(data)
+        return {
+            'kpi': self._kpis_from_scan(scan),
+            'validation': self.validate_data_integrity([data]) if data else {},
+            'insights': self._insights_from_scan(scan)
+        }
+    
     def __repr__(self) -> str:
         """String representation of the processor"""
         return f"SalesDataProcessor(exchange_rate={self.exchange_rate}, cache_size={len(self.data_cache)})"
 
 
 # Utility functions for data processing
-def calculate_financial_metrics(amount: Decimal, exchange_rate: Decimal, iva_rate: Decimal = Decimal('1.19')) -> Dict[str, Decimal]:
+def _financial_metrics(bruto, exchange_rate, iva_rate, iva_factor) -> Dict:
+    """
+    Financial metrics arithmetic shared by the scalar and batch functions
+    
+    Works unchanged on Decimals and on float64 arrays. iva_factor is
+    iva_rate - 1, supplied by the caller so the default can be reused.
+    Input checks and error handling stay in the public wrappers.
+    """
+    neto = bruto / iva_rate
+    
+    return {
+        'bruto': bruto,
+        'neto': neto,
+        'iva': neto * iva_factor,
+        'usd': bruto / exchange_rate
+    }
+
+
+def calculate_financial_metrics(amount: Decimal, exchange_rate: Decimal, iva_rate: Decimal = _DEC_IVA_DEFAULT) -> Dict[str, Decimal]:
     """
     Calculate standard financial metrics for an amount
     
@@ -1056,27 +1244,47 @@ def calculate_financial_metrics(amount: Decimal, exchange_rate: Decimal, iva_rat
         Dict[str, Decimal]: Financial metrics
     """
     try:
-        neto = amount / iva_rate
-        iva = neto * (iva_rate - Decimal('1'))
-        usd_amount = amount / exchange_rate
-        
-        return {
-            'bruto': amount,
-            'neto': neto,
-            'iva': iva,
-            'usd': usd_amount
-        }
+        iva_factor = _DEC_IVA_FACTOR if iva_rate is _DEC_IVA_DEFAULT else iva_rate - _DEC_ONE
+        return _financial_metrics(amount, exchange_rate, iva_rate, iva_factor)
         
     except Exception as e:
         logger.error("Error calculating financial metrics: %s", e)
         return {
-            'bruto': Decimal('0'),
-            'neto': Decimal('0'),
-            'iva': Decimal('0'),
-            'usd': Decimal('0')
+            'bruto': _DEC_ZERO,
+            'neto': _DEC_ZERO,
+            'iva': _DEC_ZERO,
+            'usd': _DEC_ZERO
         }
 
 
+def calculate_financial_metrics_batch(amounts, exchange_rate: Union[Decimal, float],
+                                      iva_rate: float = 1.19) -> Dict[str, np.ndarray]:
+    """
+    Calculate standard financial metrics for many amounts at once
+    
+    Float64 counterpart of calculate_financial_metrics: each metric is one
+    vectorized NumPy operation over the whole array instead of Decimal
+    arithmetic per amount. Use the Decimal version where exactness matters.
+    
+    Args:
+        amounts: Gross amounts (any array-like of numbers)
+        exchange_rate (Union[Decimal, float]): CLP to USD exchange rate
+        iva_rate (float): IVA rate (default 1.19 for Chile)
+        
+    Returns:
+        Dict[str, np.ndarray]: Financial metrics, one array per metric
+    """
+    try:
+        iva_rate = float(iva_rate)
+        return _financial_metrics(np.asarray(amounts, dtype=np.float64),
+                                  float(exchange_rate), iva_rate, iva_rate - 1.0)
+        
+    except Exception as e:
+        logger.error("Error calculating batch financial metrics: %s", e)
+        empty = np.zeros(0, dtype=np.float64)
+        return {'bruto': empty, 'neto': empty, 'iva': empty, 'usd': empty}
+
+
 def validate_date_range(start_date: date, end_date: date, business_start: date = date(2024, 4, 1)) -> bool:
     """
     Validate date range for business logic
@@ -1117,6 +1325,42 @@ def validate_date_range(start_date: date, end_date: date, business_start: date =
         return False
 
 
+def validate_date_range_batch(start_dates, end_dates,
+                              business_start: date = date(2024, 4, 1)) -> np.ndarray:
+    """
+    Validate many date ranges at once with the rules of validate_date_range
+    
+    Each rule is one vectorized comparison over datetime64[D] arrays, so
+    validating many periods does not pay a Python call and log per range.
+    
+    Args:
+        start_dates: Start dates (array-like of dates)
+        end_dates: End dates (array-like of dates, same length)
+        business_start (date): Business operation start date
+        
+    Returns:
+        np.ndarray: Boolean mask, True where the date range is valid
+    """
+    try:
+        starts = np.asarray(start_dates, dtype='datetime64[D]')
+        ends = np.asarray(end_dates, dtype='datetime64[D]')
+        
+        valid = ((starts <= ends)
+                 & (starts >= np.datetime64(business_start, 'D'))
+                 & (ends <= np.datetime64(date.today(), 'D'))
+                 & (ends - starts <= np.timedelta64(730, 'D')))
+        
+        invalid_count = int(np.count_nonzero(~valid))
+        if invalid_count:
+            logger.warning("%d of %d date ranges are invalid", invalid_count, valid.size)
+        
+        return valid
+        
+    except Exception as e:
+        logger.error("Error validating date ranges: %s", e)
+        return np.zeros(len(start_dates), dtype=bool)
+
+
 # Export functions for external integrations
 def create_summary_report(processor: SalesDataProcessor, 
                          daily_data: Dict[str, Dict], 
@@ -1135,6 +1379,10 @@ def create_summary_report(processor: SalesDataProcessor,
         Dict: Comprehensive summary report
     """
     try:
+        # Each summary is scanned once for its KPIs, validation and insights
+        daily_scan = processor._scan_once(daily_data)
+        monthly_scan = processor._scan_once(monthly_data)
+        
         report = {
             'metadata': {
                 'generated_at': datetime.now().isoformat(),
@@ -1142,8 +1390,8 @@ def create_summary_report(processor: SalesDataProcessor,
                 'report_version': '2.0.0'
             },
             'executive_summary': {
-                'daily_kpis': processor.calculate_kpi_metrics(daily_data),
-                'monthly_kpis': processor.calculate_kpi_metrics(monthly_data),
+                'daily_kpis': daily_scan['kpi'],
+                'monthly_kpis': monthly_scan['kpi'],
                 'branch_metrics': processor.calculate_branch_performance_metrics(branch_data)
             },
             'detailed_analysis': {
@@ -1152,12 +1400,12 @@ def create_summary_report(processor: SalesDataProcessor,
                 'branch_comparison': branch_data
             },
             'insights': {
-                'daily_insights': processor.get_business_insights(daily_data),
-                'monthly_insights': processor.get_business_insights(monthly_data)
+                'daily_insights': daily_scan['insights'],
+                'monthly_insights': monthly_scan['insights']
             },
             'data_quality': {
-                'daily_validation': processor.validate_data_integrity([daily_data]) if daily_data else {},
-                'monthly_validation': processor.validate_data_integrity([monthly_data]) if monthly_data else {}
+                'daily_validation': daily_scan['validation'],
+                'monthly_validation': monthly_scan['validation']
             }
         }
         
@@ -35,48 +35,206 @@ Business Value:
 """
 
 import sys
+import time
 import numpy as np
 from datetime import datetime, timedelta, date
-from collections import defaultdict
+from collections import defaultdict, deque, OrderedDict
+from itertools import islice
+from functools import lru_cache
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
     QDateEdit, QLabel, QComboBox, QCheckBox, QGroupBox, QSlider, QSpinBox,
     QMessageBox, QScrollArea, QButtonGroup, QToolTip, QSplitter, QTabWidget,
     QProgressBar, QFileDialog, QColorDialog, QDialog, QDialogButtonBox
 )
-from PyQt6.QtCore import QDate, Qt, QTimer, QThread, pyqtSignal
+from PyQt6.QtCore import (
+    QDate, Qt, QTimer, QTimeLine, QEasingCurve, QObject, QRunnable, QThreadPool, pyqtSignal
+)
 from PyQt6.QtGui import QGuiApplication, QCursor, QColor, QIcon
 import pyqtgraph as pg
 from pyqtgraph.exporters import ImageExporter
 import pandas as pd
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment
-from conexión import conectar
+from connection_pool import shared_pool
 from resource_path import resource_path
 import warnings
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
 
-class ChartAnimationThread(QThread):
-    """Thread para animaciones de gráficos sin bloquear la UI"""
-    progress_update = pyqtSignal(int)
-    animation_finished = pyqtSignal()
+# Hoja de estilos de la ventana; {background} se completa con la paleta
+_STYLE_TEMPLATE = """
+    QMainWindow {{
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+                   stop:0 {background}, stop:1 #16213e);
+    }}
+    
+    QTabWidget::pane {{
+        border: 1px solid #53354a;
+        border-radius: 5px;
+        background: {background};
+    }}
+    
+    QTabWidget::tab-bar {{
+        alignment: center;
+    }}
+    
+    QTabBar::tab {{
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+                   stop:0 #0f3460, stop:1 #53354a);
+        color: white;
+        border: 1px solid #53354a;
+        border-radius: 5px;
+        padding: 8px 16px;
+        margin: 2px;
+    }}
+    
+    QTabBar::tab:selected {{
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+                   stop:0 #e94560, stop:1 #0f3460);
+    }}
+    
+    QGroupBox {{
+        color: white;
+        border: 2px solid #53354a;
+        border-radius: 5px;
+        margin: 5px;
+        padding-top: 10px;
+        font-weight: bold;
+    }}
+    
+    QGroupBox::title {{
+        subcontrol-origin: margin;
+        left: 10px;
+        padding: 0 5px 0 5px;
+    }}
+    
+    QPushButton {{
+        background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
+                   stop:0 #0f3460, stop:1 #53354a);
+        color: white;
+        border: 1px solid #53354a;
+        border-radius: 5px;
+        padding: 8px 16px;
+        font-weight: bold;
+    }}
+    
+    QPushButton:hover {{
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+                   stop:0 #e94560, stop:1 #0f3460);
+    }}
+    
+    QPushButton:pressed {{
+        background-color: #53354a;
+    }}
+    
+    QCheckBox {{
+        color: white;
+        spacing: 5px;
+    }}
+    
+    QCheckBox::indicator {{
+        width: 18px;
+        height: 18px;
+    }}
+    
+    QCheckBox::indicator:unchecked {{
+        border: 2px solid #53354a;
+        border-radius: 3px;
+        background-color: transparent;
+    }}
+    
+    QCheckBox::indicator:checked {{
+        border: 2px solid #e94560;
+        border-radius: 3px;
+        background-color: #e94560;
+    }}
+    
+    QLabel {{
+        color: white;
+        font-weight: bold;
+    }}
+    
+    QDateEdit {{
+        background: #1a1a2e;
+        color: white;
+        border: 1px solid #53354a;
+        border-radius: 3px;
+        padding: 5px;
+    }}
+    
+    QSlider::groove:horizontal {{
+        border: 1px solid #53354a;
+        height: 8px;
+        background: #1a1a2e;
+        border-radius: 4px;
+    }}
+    
+    QSlider::handle:horizontal {{
+        background: #e94560;
+        border: 1px solid #53354a;
+        width: 18px;
+        height: 18px;
+        border-radius: 9px;
+        margin: -5px 0;
+    }}
+    
+    QProgressBar {{
+        border: 1px solid #53354a;
+        border-radius: 5px;
+        text-align: center;
+        background: #1a1a2e;
+        color: white;
+    }}
+    
+    QProgressBar::chunk {{
+        background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+                   stop:0 #e94560, stop:1 #0f3460);
+        border-radius: 5px;
+    }}
+"""
+
+
+@lru_cache(maxsize=8)
+def _build_stylesheet(background):
+    """Construye la hoja de estilos una sola vez por color de fondo"""
+    return _STYLE_TEMPLATE.format(background=background)
+
+
+class ChartLoadSignals(QObject):
+    """Señales emitidas por ChartLoadTask"""
+    finished = pyqtSignal(object, object)  # series semanales, series mensuales
+    error = pyqtSignal(str)
+
+
+class ChartLoadTask(QRunnable):
+    """
+    Recarga de datos de gráficos en segundo plano
+    
+    Ejecuta las consultas y el procesamiento de las series semanales y
+    mensuales en un hilo del pool (con conexiones del pool compartido) y
+    entrega los arreglos a la ventana, que solo actualiza las curvas.
+    """
     
-    def __init__(self, chart_widget, data_points):
+    def __init__(self, fetch_weekly, fetch_monthly, start_date, end_date, signals):
         super().__init__()
-        self.chart_widget = chart_widget
-        self.data_points = data_points
-        
+        self.fetch_weekly = fetch_weekly
+        self.fetch_monthly = fetch_monthly
+        self.start_date = start_date
+        self.end_date = end_date
+        self.signals = signals
+    
     def run(self):
-        """Ejecuta la animación de forma progresiva"""
-        for i, point in enumerate(self.data_points):
-            if i < len(self.data_points):
-                progress = int((i / len(self.data_points)) * 100)
-                self.progress_update.emit(progress)
-                self.msleep(50)  # Pausa de 50ms entre puntos
-        
-        self.animation_finished.emit()
+        """Carga las series y emite el resultado"""
+        try:
+            weekly_series = self.fetch_weekly(self.start_date, self.end_date)
+            monthly_series = self.fetch_monthly(self.end_date)
+            self.signals.finished.emit(weekly_series, monthly_series)
+            
+        except Exception as e:
+            print(f"Error refreshing chart data: {e}")
+            self.signals.error.emit(str(e))
 
 
 class InteractiveChartsWindow(QMainWindow):
@@ -92,6 +250,13 @@ class InteractiveChartsWindow(QMainWindow):
     - Configurable chart settings and animations
     """
     
+    # Semanas ISO por año como máximo (tamaño de los buffers semanales)
+    MAX_WEEKS = 53
+    
+    # Consultas de ventas recordadas (entradas) y su vigencia en segundos
+    SALES_CACHE_SIZE = 64
+    SALES_CACHE_TTL = 60
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Interactive Charts - Advanced Data Visualization System")
@@ -113,6 +278,33 @@ class InteractiveChartsWindow(QMainWindow):
         # Data storage
         self.data_manager = RealtimeDataManager()
         
+        # Buffers contiguos reutilizados por el gráfico semanal (semana, toneladas)
+        self._weekly_buffers = {
+            branch: (np.empty(self.MAX_WEEKS, dtype=np.int32),
+                     np.empty(self.MAX_WEEKS, dtype=np.float32))
+            for branch in ('Osorno', 'La Unión')
+        }
+        
+        # Caché LRU de get_sales_data: (sucursal, tipo, inicio, fin) -> (instante, filas)
+        self._sales_cache = OrderedDict()
+        
+        # Productos por tipo de venta, consultados una vez: tipo -> lista
+        self._products_cache = {}
+        
+        # SQL de ventas por (nº sucursales, nº productos)
+        self._sales_sql = {}
+        
+        # Recargas en segundo plano; solo una a la vez
+        self.chart_pool = QThreadPool(self)
+        self.chart_signals = ChartLoadSignals(self)
+        self.chart_signals.finished.connect(self._on_chart_series_loaded)
+        self.chart_signals.error.connect(self._on_chart_load_failed)
+        self._refresh_in_progress = False
+        self._settings_refresh_queued = False  # Ajustes aplicados durante una recarga
+        
+        # Línea de tiempo de la animación activa
+        self.chart_animation = None
+        
         # Timer para auto-actualización
         self.refresh_timer = QTimer()
         self.refresh_timer.timeout.connect(self.auto_update_charts)
@@ -284,6 +476,11 @@ class InteractiveChartsWindow(QMainWindow):
         self.weekly_chart.showGrid(x=True, y=True)
         weekly_layout.addWidget(self.weekly_chart)
         
+        # Curvas creadas una vez; cada recarga solo actualiza sus datos
+        self.weekly_chart.addLegend()
+        self.weekly_osorno_curve = self.weekly_chart.plot([], [], symbol='o', symbolSize=8, name='Osorno')
+        self.weekly_union_curve = self.weekly_chart.plot([], [], symbol='s', symbolSize=8, name='La Unión')
+        
         splitter.addWidget(weekly_widget)
         
         # Gráfico mensual acumulativo
@@ -296,8 +493,12 @@ class InteractiveChartsWindow(QMainWindow):
         self.monthly_chart.setLabel('bottom', 'Date')
         self.monthly_chart.setTitle('Monthly Cumulative Sales Trends')
         self.monthly_chart.showGrid(x=True, y=True)
+        self.monthly_chart.setAxisItems({'bottom': pg.DateAxisItem(orientation='bottom')})
         monthly_layout.addWidget(self.monthly_chart)
         
+        self.monthly_osorno_curve = self.monthly_chart.plot([], [], name='Osorno')
+        self.monthly_union_curve = self.monthly_chart.plot([], [], name='La Unión')
+        
         splitter.addWidget(monthly_widget)
         
         return tab_widget
@@ -357,6 +558,7 @@ class InteractiveChartsWindow(QMainWindow):
         self.short_trend_chart.setLabel('left', 'Daily Sales (Tons)')
         self.short_trend_chart.setLabel('bottom', 'Date')
         self.short_trend_chart.setTitle('Short-term Sales Trends')
+        self.short_trend_chart.setAxisItems({'bottom': pg.DateAxisItem(orientation='bottom')})
         short_term_layout.addWidget(self.short_trend_chart)
         
         splitter.addWidget(short_term_widget)
@@ -400,138 +602,7 @@ class InteractiveChartsWindow(QMainWindow):
     
     def setup_styles(self):
         """Aplica estilos profesionales a la interfaz"""
-        style = f"""
-            QMainWindow {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                           stop:0 {self.chart_colors['background']}, stop:1 #16213e);
-            }}
-            
-            QTabWidget::pane {{
-                border: 1px solid #53354a;
-                border-radius: 5px;
-                background: {self.chart_colors['background']};
-            }}
-            
-            QTabWidget::tab-bar {{
-                alignment: center;
-            }}
-            
-            QTabBar::tab {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                           stop:0 #0f3460, stop:1 #53354a);
-                color: white;
-                border: 1px solid #53354a;
-                border-radius: 5px;
-                padding: 8px 16px;
-                margin: 2px;
-            }}
-            
-            QTabBar::tab:selected {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                           stop:0 #e94560, stop:1 #0f3460);
-            }}
-            
-            QGroupBox {{
-                color: white;
-                border: 2px solid #53354a;
-                border-radius: 5px;
-                margin: 5px;
-                padding-top: 10px;
-                font-weight: bold;
-            }}
-            
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px 0 5px;
-            }}
-            
-            QPushButton {{
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1, 
-                           stop:0 #0f3460, stop:1 #53354a);
-                color: white;
-                border: 1px solid #53354a;
-                border-radius: 5px;
-                padding: 8px 16px;
-                font-weight: bold;
-            }}
-            
-            QPushButton:hover {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                           stop:0 #e94560, stop:1 #0f3460);
-            }}
-            
-            QPushButton:pressed {{
-                background-color: #53354a;
-            }}
-            
-            QCheckBox {{
-                color: white;
-                spacing: 5px;
-            }}
-            
-            QCheckBox::indicator {{
-                width: 18px;
-                height: 18px;
-            }}
-            
-            QCheckBox::indicator:unchecked {{
-                border: 2px solid #53354a;
-                border-radius: 3px;
-                background-color: transparent;
-            }}
-            
-            QCheckBox::indicator:checked {{
-                border: 2px solid #e94560;
-                border-radius: 3px;
-                background-color: #e94560;
-            }}
-            
-            QLabel {{
-                color: white;
-                font-weight: bold;
-            }}
-            
-            QDateEdit {{
-                background: #1a1a2e;
-                color: white;
-                border: 1px solid #53354a;
-                border-radius: 3px;
-                padding: 5px;
-            }}
-            
-            QSlider::groove:horizontal {{
-                border: 1px solid #53354a;
-                height: 8px;
-                background: #1a1a2e;
-                border-radius: 4px;
-            }}
-            
-            QSlider::handle:horizontal {{
-                background: #e94560;
-                border: 1px solid #53354a;
-                width: 18px;
-                height: 18px;
-                border-radius: 9px;
-                margin: -5px 0;
-            }}
-            
-            QProgressBar {{
-                border: 1px solid #53354a;
-                border-radius: 5px;
-                text-align: center;
-                background: #1a1a2e;
-                color: white;
-            }}
-            
-            QProgressBar::chunk {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                           stop:0 #e94560, stop:1 #0f3460);
-                border-radius: 5px;
-            }}
-        """
-        
-        self.setStyleSheet(style)
+        self.setStyleSheet(_build_stylesheet(self.chart_colors['background']))
     
     def initialize_data(self):
         """Inicializa los datos y carga los gráficos iniciales"""
@@ -539,17 +610,18 @@ class InteractiveChartsWindow(QMainWindow):
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         
-        # Simular carga de datos con progreso
-        for i in range(101):
-            self.progress_bar.setValue(i)
-            QApplication.processEvents()
-        
-        # Cargar gráficos iniciales
-        self.load_weekly_chart()
-        self.load_monthly_chart()
-        self.load_comparison_charts()
-        self.load_trend_charts()
+        # Cargar gráficos iniciales; el progreso avanza con cada etapa real
+        charts_to_load = [
+            self.load_weekly_chart,
+            self.load_monthly_chart,
+            self.load_comparison_charts,
+            self.load_trend_charts
+        ]
         
+        for i, load_func in enumerate(charts_to_load, start=1):
+            load_func()
+            self.progress_bar.setValue(int((i / len(charts_to_load)) * 100))
+
         self.progress_bar.setVisible(False)
         self.status_label.setText("Ready")
         self.data_info_label.setText(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
@@ -560,9 +632,19 @@ class InteractiveChartsWindow(QMainWindow):
         start_date = self.start_date.date().toPyDate()
         end_date = self.end_date.date().toPyDate()
         
-        # Cargar datos de Osorno
-        osorno_data = self.get_sales_data('Osorno', 'Local', start_date, end_date)
-        union_data = self.get_sales_data('La Unión', 'Local', start_date, end_date)
+        self.plot_weekly_chart(self.fetch_weekly_series(start_date, end_date))
+    
+    def fetch_weekly_series(self, start_date, end_date):
+        """
+        Obtiene y procesa las series semanales (sin tocar widgets)
+        
+        Returns:
+            tuple: (semanas_osorno, valores_osorno, semanas_union, valores_union)
+        """
+        # Cargar datos de ambas sucursales en una sola consulta
+        sales_data = self.get_sales_data_multi(['Osorno', 'La Unión'], 'Local', start_date, end_date)
+        osorno_data = sales_data['Osorno']
+        union_data = sales_data['La Unión']
         
         if osorno_data or union_data:
             # Procesar datos reales
@@ -575,33 +657,64 @@ class InteractiveChartsWindow(QMainWindow):
             values_union = np.cumsum(np.random.normal(45, 8, 12))
             weeks_osorno = weeks_union = weeks
         
-        self.weekly_chart.clear()
+        return weeks_osorno, values_osorno, weeks_union, values_union
+    
+    def plot_weekly_chart(self, series):
+        """Dibuja las series semanales en las curvas existentes"""
+        weeks_osorno, values_osorno, weeks_union, values_union = series
+        
+        # Copiar a los buffers float32 para que PyQtGraph no convierta listas
+        weeks_osorno, values_osorno = self._fill_weekly_buffer('Osorno', weeks_osorno, values_osorno)
+        weeks_union, values_union = self._fill_weekly_buffer('La Unión', weeks_union, values_union)
         
         # Configurar colores y estilos
         pen_osorno = pg.mkPen(color=self.chart_colors['Osorno'], width=3)
         pen_union = pg.mkPen(color=self.chart_colors['La Unión'], width=3)
         
-        # Plotear líneas
-        plot_osorno = self.weekly_chart.plot(weeks_osorno, values_osorno, pen=pen_osorno, 
-                                           symbol='o', symbolSize=8, name='Osorno')
-        plot_union = self.weekly_chart.plot(weeks_union, values_union, pen=pen_union, 
-                                          symbol='s', symbolSize=8, name='La Unión')
+        # Actualizar las curvas existentes
+        self.weekly_osorno_curve.setData(weeks_osorno, values_osorno, pen=pen_osorno)
+        self.weekly_union_curve.setData(weeks_union, values_union, pen=pen_union)
         
         # Agregar líneas de tendencia
         self.weekly_chart.add_trend_line(values_osorno)
+    
+    def _fill_weekly_buffer(self, branch, weeks, values):
+        """
+        Copia una serie semanal en los buffers preasignados de la sucursal
         
-        # Agregar leyenda
-        legend = self.weekly_chart.addLegend()
+        Args:
+            branch (str): Sucursal (Osorno, La Unión)
+            weeks: Números de semana
+            values: Toneladas acumuladas por semana
+            
+        Returns:
+            tuple: Vistas (semanas, valores) sobre los buffers
+        """
+        weeks_buffer, values_buffer = self._weekly_buffers[branch]
+        n = len(weeks)
+        np.copyto(weeks_buffer[:n], np.asarray(weeks, dtype=np.int32))
+        np.copyto(values_buffer[:n], np.asarray(values, dtype=np.float32))
+        return weeks_buffer[:n], values_buffer[:n]
     
     def load_monthly_chart(self):
         """Carga el gráfico mensual con datos reales"""
-        # Obtener datos de los últimos 6 meses
         end_date = self.end_date.date().toPyDate()
+        self.plot_monthly_chart(self.fetch_monthly_series(end_date))
+    
+    def fetch_monthly_series(self, end_date):
+        """
+        Obtiene y procesa las series diarias acumuladas (sin tocar widgets)
+        
+        Returns:
+            tuple: (fechas_osorno, valores_osorno, fechas_union, valores_union)
+        """
+        # Obtener datos de los últimos 6 meses
         start_date = (end_date - timedelta(days=180))
         
         # Cargar datos reales
-        osorno_data = self.get_sales_data('Osorno', 'Local', start_date, end_date)
-        union_data = self.get_sales_data('La Unión', 'Local', start_date, end_date)
+        sales_data = self.get_sales_data_multi(['Osorno', 'La Unión'], 'Local', start_date, end_date)
+        osorno_data = sales_data['Osorno']
+        union_data = sales_data['La Unión']
         
         if osorno_data or union_data:
             # Procesar datos reales
@@ -610,28 +723,27 @@ class InteractiveChartsWindow(QMainWindow):
         else:
             # Datos de demostración
             dates = pd.date_range(start=start_date, end=end_date, freq='D')
-            timestamps = [date.timestamp() for date in dates]
+            timestamps = dates.to_numpy(dtype="datetime64[s]").astype(np.int64).astype(np.float64)  # Segundos desde epoch
             values_osorno = np.cumsum(np.random.normal(2, 0.5, len(dates)))
             values_union = np.cumsum(np.random.normal(1.8, 0.4, len(dates)))
             dates_osorno = dates_union = timestamps
         
-        self.monthly_chart.clear()
+        return dates_osorno, values_osorno, dates_union, values_union
+    
+    def plot_monthly_chart(self, series):
+        """Dibuja las series diarias acumuladas en las curvas existentes"""
+        dates_osorno, values_osorno, dates_union, values_union = series
         
         # Configurar colores y estilos
         pen_osorno = pg.mkPen(color=self.chart_colors['Osorno'], width=2)
         pen_union = pg.mkPen(color=self.chart_colors['La Unión'], width=2)
         
-        # Plotear líneas
-        self.monthly_chart.plot(dates_osorno, values_osorno, pen=pen_osorno, name='Osorno')
-        self.monthly_chart.plot(dates_union, values_union, pen=pen_union, name='La Unión')
+        # Actualizar las curvas existentes
+        self.monthly_osorno_curve.setData(dates_osorno, values_osorno, pen=pen_osorno)
+        self.monthly_union_curve.setData(dates_union, values_union, pen=pen_union)
         
-        # Configurar eje de fechas
-        axis = pg.DateAxisItem(orientation='bottom')
-        self.monthly_chart.setAxisItems({'bottom': axis})
-        
-        # Agregar banda de confianza
-        if len(values_osorno) > 3:
-            self.monthly_chart.add_confidence_band(dates_osorno, values_osorno)
+        # Agregar banda de confianza (se oculta si no hay datos suficientes)
+        self.monthly_chart.add_confidence_band(dates_osorno, values_osorno)
     
     def load_comparison_charts(self):
         """Carga los gráficos de comparación"""
@@ -683,7 +795,7 @@ class InteractiveChartsWindow(QMainWindow):
         smoothed_sales = DataProcessor.calculate_moving_average(daily_sales, window_size=7)
         
         self.short_trend_chart.clear()
-        timestamps_short = [date.timestamp() for date in dates_short]
+        timestamps_short = dates_short.to_numpy(dtype="datetime64[s]").astype(np.int64).astype(np.float64)  # Segundos desde epoch
         
         # Datos originales
         self.short_trend_chart.plot(timestamps_short, daily_sales, 
@@ -698,16 +810,12 @@ class InteractiveChartsWindow(QMainWindow):
         trend_color = 'green' if trend == 'upward' else 'red' if trend == 'downward' else 'yellow'
         
         # Línea de tendencia
-        z = np.polyfit(range(len(smoothed_sales)), smoothed_sales, 1)
-        trend_line = np.poly1d(z)(range(len(smoothed_sales)))
+        slope, intercept = DataProcessor.linear_fit(smoothed_sales)
+        trend_line = slope * np.arange(len(smoothed_sales)) + intercept
         self.short_trend_chart.plot(timestamps_short, trend_line, 
                                    pen=pg.mkPen(trend_color, style=Qt.PenStyle.DashLine, width=2),
                                    name=f'Trend: {trend}')
         
-        # Configurar eje de fechas
-        axis_short = pg.DateAxisItem(orientation='bottom')
-        self.short_trend_chart.setAxisItems({'bottom': axis_short})
-        
         # Tendencias a largo plazo (6 meses)
         months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun']
         monthly_avg = [45, 48, 52, 55, 58, 62]
@@ -744,60 +852,112 @@ class InteractiveChartsWindow(QMainWindow):
         Returns:
             list: Datos de ventas
         """
-        try:
-            conn = conectar()
-            if conn is None:
-                return []
-            
-            cursor = conn.cursor(dictionary=True)
+        return self.get_sales_data_multi([branch], sales_type, start_date, end_date)[branch]
+    
+    def get_sales_data_multi(self, branches, sales_type: str, start_date, end_date):
+        """
+        Obtiene las ventas de varias sucursales con una sola consulta
+        
+        Las sucursales cuyo resultado sigue en caché no se consultan; el
+        resto se agrupa por sucursal y fecha en el servidor y las filas se
+        reparten por sucursal.
+        
+        Args:
+            branches (list): Sucursales (Osorno, La Unión)
+            sales_type (str): Tipo de venta (Local, Distribuidor)
+            start_date: Fecha de inicio
+            end_date: Fecha de fin
             
+        Returns:
+            dict: Datos de ventas por sucursal
+        """
+        results = {}
+        missing = []
+        
+        # Reutilizar los resultados de consultas hechas hace poco
+        now = time.monotonic()
+        for branch in branches:
+            cache_key = (branch, sales_type, start_date, end_date)
+            cached = self._sales_cache.get(cache_key)
+            if cached is not None and now - cached[0] < self.SALES_CACHE_TTL:
+                self._sales_cache.move_to_end(cache_key)
+                results[branch] = cached[1]
+            else:
+                results[branch] = []
+                missing.append(branch)
+        
+        if not missing:
+            return results
+        
+        try:
             # Obtener productos según tipo de venta
             products = self.get_products_by_type(sales_type)
             
             if not products:
-                cursor.close()
-                conn.close()
-                return []
-            
-            # Query parameterizada
-            placeholders = ', '.join(['%s'] * len(products))
-            query = f"""
-                SELECT Fecha AS fecha, SUM(Unidad) as total_cantidad
-                FROM VentasDiarias
-                WHERE PuntoVenta = %s AND Articulo IN ({placeholders}) 
-                      AND Fecha BETWEEN %s AND %s
-                GROUP BY Fecha
-                ORDER BY Fecha ASC
-            """
+                return results
             
-            cursor.execute(query, (branch, *products, start_date, end_date))
-            data = cursor.fetchall()
+            # Conexión reutilizada del pool compartido y sentencia preparada
+            # por forma de la consulta: el servidor no vuelve a analizarla
+            shape = (len(missing), len(products))
+            query = self._sales_query(*shape)
+            with shared_pool.connection() as conn:
+                cursor = shared_pool.prepared_cursor(conn, ('charts_sales',) + shape)
+                cursor.execute(query, (*missing, *products, start_date, end_date))
+                columns = cursor.column_names
+                for branch, *values in cursor.fetchall():
+                    branch_rows = results.get(branch)
+                    if branch_rows is not None:
+                        branch_rows.append(dict(zip(columns[1:], values)))
             
-            cursor.close()
-            conn.close()
+            loaded_at = time.monotonic()
+            for branch in missing:
+                cache_key = (branch, sales_type, start_date, end_date)
+                self._sales_cache[cache_key] = (loaded_at, results[branch])
+                self._sales_cache.move_to_end(cache_key)
+            while len(self._sales_cache) > self.SALES_CACHE_SIZE:
+                self._sales_cache.popitem(last=False)
             
-            return data
+            return results
             
         except Exception as e:
             print(f"Error loading sales data: {e}")
-            return []
+            return results
+    
+    def _sales_query(self, branch_count: int, product_count: int) -> str:
+        """SQL de ventas por sucursal y fecha, construido una vez por forma"""
+        shape = (branch_count, product_count)
+        query = self._sales_sql.get(shape)
+        if query is None:
+            branch_placeholders = ', '.join(['%s'] * branch_count)
+            placeholders = ', '.join(['%s'] * product_count)
+            query = f"""
+                SELECT PuntoVenta AS sucursal, Fecha AS fecha, SUM(Unidad) as total_cantidad
+                FROM VentasDiarias
+                WHERE PuntoVenta IN ({branch_placeholders}) AND Articulo IN ({placeholders}) 
+                      AND Fecha BETWEEN %s AND %s
+                GROUP BY PuntoVenta, Fecha
+                ORDER BY Fecha ASC
+            """
+            self._sales_sql[shape] = query
+        return query
     
     def get_products_by_type(self, sales_type: str):
         """Obtiene productos filtrados por tipo de venta"""
+        cached = self._products_cache.get(sales_type)
+        if cached is not None:
+            return cached
+        
         try:
-            conn = conectar()
-            if conn is None:
-                return []
-            
-            cursor = conn.cursor(dictionary=True)
-            query = "SELECT Producto FROM Productos WHERE tipo_venta = %s"
-            cursor.execute(query, (sales_type,))
-            
-            products = [row['Producto'] for row in cursor.fetchall()]
-            
-            cursor.close()
-            conn.close()
+            with shared_pool.connection() as conn:
+                cursor = conn.cursor(dictionary=True)
+                query = "SELECT Producto FROM Productos WHERE tipo_venta = %s"
+                cursor.execute(query, (sales_type,))
+                
+                products = [row['Producto'] for row in cursor.fetchall()]
+                
+                cursor.close()
             
+            self._products_cache[sales_type] = products
             return products
             
         except Exception as e:
@@ -808,57 +968,39 @@ class InteractiveChartsWindow(QMainWindow):
             else:
                 return ["Pellet Bolsa 15 Kg (Distribuidor)"]
     
+    def invalidate_products_cache(self):
+        """Olvida los productos por tipo de venta para volver a consultarlos"""
+        self._products_cache.clear()
+    
     def process_weekly_data(self, raw_data):
         """Procesa datos para vista semanal acumulativa"""
         if not raw_data:
             return [], []
         
-        # Convertir a datos semanales acumulativos
-        weekly_totals = defaultdict(float)
+        # Convertir a datos semanales acumulativos en un solo groupby
+        df = pd.DataFrame.from_records(raw_data, columns=["fecha", "total_cantidad"])
+        fechas = pd.to_datetime(df["fecha"])
+        toneladas = df["total_cantidad"].astype(float) * 15 / 1000  # Convertir a toneladas
         
-        for item in raw_data:
-            fecha = item["fecha"]
-            cantidad = float(item["total_cantidad"])
-            
-            if isinstance(fecha, str):
-                fecha = datetime.strptime(fecha, "%Y-%m-%d").date()
-            
-            # Obtener número de semana
-            _, week_num, _ = fecha.isocalendar()
-            weekly_totals[week_num] += cantidad * 15 / 1000  # Convertir a toneladas
-        
-        # Crear datos acumulativos
-        weeks = sorted(weekly_totals.keys())
-        cumulative = 0
-        cumulative_values = []
+        # Agrupar por número de semana ISO y acumular
+        weekly_totals = toneladas.groupby(fechas.dt.isocalendar().week.to_numpy()).sum()
         
-        for week in weeks:
-            cumulative += weekly_totals[week]
-            cumulative_values.append(cumulative)
-        
-        return weeks, cumulative_values
+        return weekly_totals.index.tolist(), weekly_totals.cumsum().to_numpy()
     
     def process_daily_cumulative(self, raw_data):
         """Procesa datos para vista diaria acumulativa"""
         if not raw_data:
             return [], []
         
-        dates = []
-        cumulative_values = []
-        cumulative = 0
+        # Fechas y acumulado en operaciones vectorizadas, sin bucle por fila
+        df = pd.DataFrame.from_records(raw_data, columns=["fecha", "total_cantidad"])
+        fechas = pd.to_datetime(df["fecha"])
+        toneladas = df["total_cantidad"].astype(float) * 15 / 1000  # Convertir a toneladas
         
-        for item in raw_data:
-            fecha = item["fecha"]
-            cantidad = float(item["total_cantidad"])
-            
-            if isinstance(fecha, str):
-                fecha = datetime.strptime(fecha, "%Y-%m-%d").date()
-            
-            cumulative += cantidad * 15 / 1000  # Convertir a toneladas
-            dates.append(fecha.timestamp())
-            cumulative_values.append(cumulative)
+        # Segundos desde epoch, igual que Timestamp.timestamp() en los datos de demostración
+        timestamps = fechas.to_numpy(dtype="datetime64[s]").astype(np.int64).astype(np.float64)
         
-        return dates, cumulative_values
+        return timestamps, toneladas.cumsum().to_numpy()
     
     # Métodos de interacción y eventos
     def toggle_animation(self, enabled):
@@ -883,29 +1025,67 @@ class InteractiveChartsWindow(QMainWindow):
     
     def refresh_all_charts(self):
         """Actualiza todos los gráficos"""
+        # Una sola recarga a la vez: la tarea en curso usa las cachés de consultas
+        if self._refresh_in_progress:
+            return
+        
         self.status_label.setText("Refreshing charts...")
         self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
         
-        # Lista de funciones de actualización
-        charts_to_update = [
-            self.load_weekly_chart,
-            self.load_monthly_chart,
-            self.load_comparison_charts,
-            self.load_trend_charts
-        ]
-        
-        for i, update_func in enumerate(charts_to_update):
-            self.progress_bar.setValue(int((i / len(charts_to_update)) * 100))
-            QApplication.processEvents()
-            update_func()
+        # Las consultas y el procesamiento corren en el pool; los widgets
+        # se leen aquí y se actualizan en _on_chart_series_loaded
+        self._refresh_in_progress = True
+        self.chart_pool.start(ChartLoadTask(
+            self.fetch_weekly_series, self.fetch_monthly_series,
+            self.start_date.date().toPyDate(), self.end_date.date().toPyDate(),
+            self.chart_signals
+        ))
+    
+    def _on_chart_series_loaded(self, weekly_series, monthly_series):
+        """Dibuja las series cargadas en segundo plano y los gráficos locales"""
+        self._refresh_in_progress = False
+        
+        self.plot_weekly_chart(weekly_series)
+        self.progress_bar.setValue(25)
+        self.plot_monthly_chart(monthly_series)
+        self.progress_bar.setValue(50)
+        self.load_comparison_charts()
+        self.progress_bar.setValue(75)
+        self.load_trend_charts()
         
         self.progress_bar.setValue(100)
         self.progress_bar.setVisible(False)
         self.status_label.setText("Charts updated")
         self.data_info_label.setText(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
+        
+        self._run_queued_settings_refresh()
+    
+    def _on_chart_load_failed(self, message):
+        """Informa una recarga fallida"""
+        self._refresh_in_progress = False
+        self.progress_bar.setVisible(False)
+        self.status_label.setText(f"Refresh failed: {message}")
+        
+        self._run_queued_settings_refresh()
+    
+    def _run_queued_settings_refresh(self):
+        """Recarga con los ajustes aplicados mientras otra recarga estaba en curso"""
+        if self._settings_refresh_queued:
+            self._settings_refresh_queued = False
+            self.invalidate_products_cache()
+            self.refresh_all_charts()
     
     def auto_update_charts(self):
         """Actualización automática de gráficos"""
+        if self._refresh_in_progress:
+            return
+        
+        # Solo los rangos que llegan hasta hoy pueden tener ventas nuevas
+        today = date.today()
+        for key in [key for key in self._sales_cache if key[3] >= today]:
+            del self._sales_cache[key]
+        
         self.refresh_all_charts()
     
     def animate_charts(self):
@@ -913,12 +1093,19 @@ class InteractiveChartsWindow(QMainWindow):
         if not self.animation_enabled:
             return
         
-        # Ejemplo de animación para el gráfico semanal
+        # Ejemplo de animación para el gráfico semanal: 50ms por punto,
+        # programada por el bucle de eventos en lugar de un hilo dormido
         data_points = list(range(12))  # 12 semanas de datos
-        animation_thread = ChartAnimationThread(self.weekly_chart, data_points)
-        animation_thread.progress_update.connect(self.update_animation_progress)
-        animation_thread.animation_finished.connect(self.on_animation_finished)
-        animation_thread.start()
+        if self.chart_animation is not None:
+            self.chart_animation.stop()
+            self.chart_animation.deleteLater()
+        
+        self.chart_animation = QTimeLine(len(data_points) * 50, self)
+        self.chart_animation.setEasingCurve(QEasingCurve(QEasingCurve.Type.Linear))
+        self.chart_animation.setFrameRange(0, 100)  # Progreso en porcentaje
+        self.chart_animation.frameChanged.connect(self.update_animation_progress)
+        self.chart_animation.finished.connect(self.on_animation_finished)
+        self.chart_animation.start()
     
     def update_animation_progress(self, progress):
         """Actualiza el progreso de la animación"""
@@ -968,8 +1155,22 @@ class InteractiveChartsWindow(QMainWindow):
         self.chart_colors.update(settings.get('colors', {}))
         self.animation_enabled = settings.get('animation_enabled', True)
         
+        # La tarea en curso usa la caché de productos; la recarga con las
+        # nuevas configuraciones se hace cuando termine
+        if self._refresh_in_progress:
+            self._settings_refresh_queued = True
+            return
+        
+        self.invalidate_products_cache()
+        
         # Recargar gráficos con nuevas configuraciones
         self.refresh_all_charts()
+    
+    def closeEvent(self, event):
+        """Espera una recarga en curso antes de cerrar"""
+        self.refresh_timer.stop()
+        self.chart_pool.waitForDone()
+        event.accept()
 
 
 class ChartSettingsDialog(QDialog):
@@ -1077,14 +1278,39 @@ class DataProcessor:
         if len(data) < window_size:
             return data
         
-        moving_avg = []
-        for i in range(len(data)):
-            if i < window_size - 1:
-                moving_avg.append(np.mean(data[:i+1]))
-            else:
-                moving_avg.append(np.mean(data[i-window_size+1:i+1]))
+        # Sumas acumuladas: cada ventana es una resta, sin bucle en Python
+        values = np.asarray(data, dtype=np.float64)
+        cumulative = np.empty(len(values) + 1)
+        cumulative[0] = 0.0
+        np.cumsum(values, out=cumulative[1:])
+        
+        # Las primeras posiciones promedian las ventanas parciales disponibles
+        partial = cumulative[1:window_size] / np.arange(1, window_size)
+        full = (cumulative[window_size:] - cumulative[:-window_size]) / window_size
         
-        return moving_avg
+        return np.concatenate((partial, full))
+    
+    @staticmethod
+    def linear_fit(data):
+        """
+        Ajusta una recta por mínimos cuadrados a los datos (x = 0, 1, ...)
+        
+        Forma cerrada para grado 1: las sumas de x y x² dependen solo de n,
+        por lo que basta una pasada sobre los datos en lugar de np.polyfit.
+        
+        Returns:
+            tuple: (pendiente, intercepto)
+        """
+        y = np.asarray(data, dtype=np.float64)
+        n = len(y)
+        sum_x = n * (n - 1) / 2
+        sum_xx = (n - 1) * n * (2 * n - 1) / 6
+        sum_y = y.sum()
+        sum_xy = np.arange(n) @ y
+        
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_xx - sum_x * sum_x)
+        intercept = (sum_y - slope * sum_x) / n
+        return slope, intercept
     
     @staticmethod
     def detect_trends(data, threshold=0.1):
@@ -1093,8 +1319,7 @@ class DataProcessor:
             return "insufficient_data"
         
         # Calcular pendiente promedio
-        x = np.arange(len(data))
-        slope, _ = np.polyfit(x, data, 1)
+        slope, _ = DataProcessor.linear_fit(data)
         
         if slope > threshold:
             return "upward"
@@ -1109,20 +1334,19 @@ class DataProcessor:
         if len(data) < season_length * 2:
             return None
         
-        # Calcular promedio móvil centrado
-        centered_ma = []
+        # Calcular promedio móvil centrado con sumas acumuladas
+        values = np.asarray(data, dtype=np.float64)
         half_season = season_length // 2
+        window = 2 * half_season + 1
         
-        for i in range(half_season, len(data) - half_season):
-            centered_ma.append(np.mean(data[i-half_season:i+half_season+1]))
+        cumulative = np.concatenate(([0.0], np.cumsum(values)))
+        centered_ma = (cumulative[window:] - cumulative[:-window]) / window
         
-        # Calcular índices estacionales
-        seasonal_indices = []
-        for i in range(len(centered_ma)):
-            if centered_ma[i] != 0:
-                seasonal_indices.append(data[i + half_season] / centered_ma[i])
+        # Calcular índices estacionales (se omiten promedios nulos)
+        centered_values = values[half_season:len(values) - half_season]
+        nonzero = centered_ma != 0
         
-        return seasonal_indices
+        return (centered_values[nonzero] / centered_ma[nonzero]).tolist()
     
     @staticmethod
     def forecast_linear(data, periods=5):
@@ -1130,8 +1354,7 @@ class DataProcessor:
         if len(data) < 2:
             return [data[-1]] * periods if data else [0] * periods
         
-        x = np.arange(len(data))
-        slope, intercept = np.polyfit(x, data, 1)
+        slope, intercept = DataProcessor.linear_fit(data)
         
         forecast_x = np.arange(len(data), len(data) + periods)
         forecast = slope * forecast_x + intercept
@@ -1148,6 +1371,7 @@ class AdvancedChartWidget(pg.PlotWidget):
         self.data_points = []
         self.trend_line = None
         self.confidence_band = None
+        self.confidence_curves = None
     
     def setup_advanced_features(self):
         """Configura características avanzadas del gráfico"""
@@ -1181,11 +1405,13 @@ class AdvancedChartWidget(pg.PlotWidget):
             return
         
         x = np.arange(len(data))
-        slope, intercept = np.polyfit(x, data, 1)
+        slope, intercept = DataProcessor.linear_fit(data)
         trend_data = slope * x + intercept
         
-        if self.trend_line:
-            self.removeItem(self.trend_line)
+        # Reutilizar la línea si sigue en el gráfico (clear() la elimina)
+        if self.trend_line is not None and self.trend_line in self.plotItem.items:
+            self.trend_line.setData(x, trend_data)
+            return
         
         self.trend_line = self.plot(x, trend_data, 
                                    pen=pg.mkPen('#FFD700', style=Qt.PenStyle.DashLine, width=2),
@@ -1193,7 +1419,9 @@ class AdvancedChartWidget(pg.PlotWidget):
     
     def add_confidence_band(self, x_data, y_data, confidence=0.95):
         """Agrega banda de confianza alrededor de los datos"""
-        if len(x_data) != len(y_data) or len(x_data) < 3:
+        if len(x_data) != len(y_data) or len(x_data) <= 3:
+            if self.confidence_band is not None:
+                self.confidence_band.setVisible(False)
             return
         
         # Calcular desviación estándar
@@ -1203,12 +1431,19 @@ class AdvancedChartWidget(pg.PlotWidget):
         upper_bound = np.array(y_data) + confidence_factor * std_dev
         lower_bound = np.array(y_data) - confidence_factor * std_dev
         
-        if self.confidence_band:
-            self.removeItem(self.confidence_band)
+        # Reutilizar la banda si sigue en el gráfico: sus curvas se actualizan
+        # y el relleno las sigue
+        if self.confidence_band is not None and self.confidence_band in self.plotItem.items:
+            upper_curve, lower_curve = self.confidence_curves
+            upper_curve.setData(x_data, upper_bound)
+            lower_curve.setData(x_data, lower_bound)
+            self.confidence_band.setVisible(True)
+            return
         
         # Crear banda de confianza usando FillBetweenItem
         upper_curve = self.plot(x_data, upper_bound, pen=None)
         lower_curve = self.plot(x_data, lower_bound, pen=None)
+        self.confidence_curves = (upper_curve, lower_curve)
         
         self.confidence_band = pg.FillBetweenItem(
             curve1=upper_curve,
@@ -1222,34 +1457,32 @@ class AdvancedChartWidget(pg.PlotWidget):
         if len(data) < 3:
             return
         
-        mean_val = np.mean(data)
-        std_val = np.std(data)
+        values = np.asarray(data, dtype=np.float64)
+        std_val = values.std()
+        if std_val == 0:
+            return
         
-        anomalies = []
-        for i, value in enumerate(data):
-            z_score = abs((value - mean_val) / std_val)
-            if z_score > threshold:
-                anomalies.append((i, value))
+        # Puntajes z de toda la serie en una sola operación
+        z_scores = np.abs((values - values.mean()) / std_val)
+        anomaly_x = np.flatnonzero(z_scores > threshold)
         
-        # Marcar anomalías
-        for x, y in anomalies:
-            self.plot([x], [y], pen=None, symbol='o', symbolBrush='r', 
-                     symbolSize=15, name='Anomaly')
+        # Marcar todas las anomalías con un único elemento de dispersión
+        if anomaly_x.size:
+            self.addItem(pg.ScatterPlotItem(x=anomaly_x, y=values[anomaly_x], pen=None,
+                                            symbol='o', brush='r', size=15, name='Anomaly'))
 
 
 class RealtimeDataManager:
     """Gestor de datos en tiempo real"""
     
     def __init__(self):
-        self.data_buffer = defaultdict(list)
         self.max_buffer_size = 1000
+        # Buffers circulares: al llenarse descartan el punto más antiguo en O(1)
+        self.data_buffer = defaultdict(lambda: deque(maxlen=self.max_buffer_size))
         self.update_callbacks = []
     
     def add_data_point(self, series_name, timestamp, value):
         """Agrega un punto de datos a la serie especificada"""
-        if len(self.data_buffer[series_name]) >= self.max_buffer_size:
-            self.data_buffer[series_name].pop(0)  # Remover el más antiguo
-        
         self.data_buffer[series_name].append((timestamp, value))
         
         # Notificar callbacks
@@ -1258,10 +1491,10 @@ class RealtimeDataManager:
     
     def get_series_data(self, series_name, last_n=None):
         """Obtiene los datos de una serie"""
-        data = self.data_buffer.get(series_name, [])
+        data = self.data_buffer.get(series_name, ())
         if last_n:
-            return data[-last_n:]
-        return data
+            return list(islice(data, max(len(data) - last_n, 0), None))
+        return list(data)
     
     def register_update_callback(self, callback):
         """Registra un callback para actualizaciones de datos"""
@@ -0,0 +1,95 @@
+"""
+Sales Data Processor Tests
+
+Checks that the column-wise data integrity validation reports the same
+issues as the original per-record checks.
+
+Run from the application folder:
+    python -m unittest discover -s tests
+
+@author Daniel Jara
+@version 2.0.0
+@since Python 3.8+
+"""
+
+import os
+import sys
+import types
+import unittest
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# conexión.py holds the site's database credentials and is not versioned;
+# validation never connects, so a placeholder is enough to import it
+if "conexión" not in sys.modules:
+    try:
+        import conexión  # noqa: F401
+    except ImportError:
+        placeholder = types.ModuleType("conexión")
+        placeholder.conectar = lambda: None
+        sys.modules["conexión"] = placeholder
+
+from data_processor import SalesDataProcessor
+
+
+# Marks a field to leave out of the record entirely
+_DROP = object()
+
+
+def _record(**fields):
+    """A valid branch totals row with ``fields`` overridden"""
+    record = {"PuntoVenta": "Osorno", "Articulo": "Pellet 15kg",
+              "total_cantidad": 10, "total_total": 59500, "total_neto": 50000}
+    record.update(fields)
+    return {key: value for key, value in record.items() if value is not _DROP}
+
+
+class ValidateDataIntegrityTests(unittest.TestCase):
+    """validate_data_integrity keeps the original per-record semantics"""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.processor = SalesDataProcessor()
+    
+    def _issues(self, *records):
+        return self.processor.validate_data_integrity(list(records))["issues"]
+    
+    def test_valid_records_have_no_issues(self):
+        report = self.processor.validate_data_integrity(
+            [_record(), _record(total_cantidad=Decimal("2.5"), total_total="1190")]
+        )
+        self.assertTrue(report["is_valid"])
+        self.assertEqual(report["issues"], [])
+    
+    def test_none_in_optional_numeric_field_is_invalid(self):
+        self.assertEqual(self._issues(_record(), _record(total_neto=None)),
+                         ["Record 1: Invalid numeric value in field 'total_neto'"])
+    
+    def test_absent_optional_numeric_field_is_not_checked(self):
+        self.assertEqual(self._issues(_record(total_neto=_DROP)), [])
+    
+    def test_nan_values_are_numeric(self):
+        self.assertEqual(self._issues(_record(total_cantidad=float("nan")),
+                                      _record(total_neto="nan")), [])
+    
+    def test_missing_required_field_is_reported_once(self):
+        self.assertEqual(self._issues(_record(total_cantidad=None), _record(Articulo=_DROP)),
+                         ["Record 0: Missing required field 'total_cantidad'",
+                          "Record 1: Missing required field 'Articulo'"])
+    
+    def test_non_numeric_text_is_invalid(self):
+        self.assertEqual(self._issues(_record(total_total="abc")),
+                         ["Record 0: Invalid numeric value in field 'total_total'"])
+    
+    def test_negative_amounts_are_warnings(self):
+        report = self.processor.validate_data_integrity(
+            [_record(total_cantidad=-1), _record(total_total=-5)]
+        )
+        self.assertTrue(report["is_valid"])
+        self.assertEqual(report["warnings"], ["Record 0: Negative quantity detected",
+                                              "Record 1: Negative total amount detected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Excel Export Engine Tests
+
+Exports a small result set containing SQL NULLs through both export
+backends and checks the workbook comes out with blank cells.
+
+Run from the application folder:
+    python -m unittest discover -s tests
+
+@author Daniel Jara
+@version 2.0.0
+@since Python 3.8+
+"""
+
+import os
+import sys
+import types
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# conexión.py holds the site's database credentials and is not versioned;
+# the exporter never connects, so a placeholder is enough to import it
+if "conexión" not in sys.modules:
+    try:
+        import conexión  # noqa: F401
+    except ImportError:
+        placeholder = types.ModuleType("conexión")
+        placeholder.conectar = lambda: None
+        sys.modules["conexión"] = placeholder
+
+from advanced_search_system import ExcelExportEngine, RESULT_COLUMNS, xlsxwriter
+
+
+def _results_with_nulls() -> pd.DataFrame:
+    """Two result rows; the second has NULLs in text, date and number columns"""
+    frame = pd.DataFrame({
+        "VentaID": [1, 2],
+        "Articulo": ["Pellet 15kg", None],
+        "PuntoVenta": ["Osorno", "La Unión"],
+        "Fecha": pd.to_datetime(["2024-06-01", None]),
+        "TipoDocumento": ["Boleta", "Factura"],
+        "NumeroDocumento": ["100", "101"],
+        "Unidad": [10.0, np.nan],
+        "KilosTotales": [150.0, np.nan],
+        "ValorUnitario": [5000.0, 5200.0],
+        "Descuento": [0.0, np.nan],
+        "Neto": [42017.0, np.nan],
+        "IVA": [7983.0, np.nan],
+        "Total": [50000.0, np.nan],
+        "NetoPorKG": [280.1, np.nan],
+        "Pago": ["Pagado", None],
+        "NumeroComprobante": ["A1", None],
+        "MedioPago": ["Efectivo", None],
+    })
+    return frame.loc[:, list(RESULT_COLUMNS)]
+
+
+class ExcelExportNullTests(unittest.TestCase):
+    """NULL values must export as blank cells on every backend"""
+    
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+        self.engine = ExcelExportEngine()
+    
+    def _export(self, backend: str):
+        self.engine._backend = backend
+        filename = os.path.join(self.tempdir.name, f"results_{backend}.xlsx")
+        exported = self.engine.export_search_results(
+            _results_with_nulls(), filename, {"Report Title": "Sales Search Results"}
+        )
+        self.assertTrue(exported)
+        return load_workbook(filename).active
+    
+    def _assert_null_row_blank(self, ws):
+        # Title, one metadata row and a separator precede the header row
+        header_row = 4
+        self.assertEqual(ws.cell(row=header_row, column=1).value, "Venta ID")
+        null_row = [cell.value for cell in ws[header_row + 2]]
+        for col_idx, key in enumerate(RESULT_COLUMNS):
+            if key in ("VentaID", "PuntoVenta", "TipoDocumento",
+                       "NumeroDocumento", "ValorUnitario"):
+                self.assertNotIn(null_row[col_idx], (None, ""), key)
+            else:
+                self.assertIn(null_row[col_idx], (None, ""), key)
+        
+        # NULL totals count as zero in the summary below the table
+        summary = {row[0].value: row[1].value for row in ws.iter_rows(min_row=header_row + 4)
+                   if row[0].value}
+        self.assertEqual(summary["Total Records:"], 2)
+        self.assertEqual(summary["Total Sales Amount:"], "50,000 CLP")
+        self.assertEqual(summary["Total Units Sold:"], "10")
+    
+    def test_openpyxl_backend_writes_nulls_as_blank(self):
+        self._assert_null_row_blank(self._export("openpyxl"))
+    
+    @unittest.skipIf(xlsxwriter is None, "xlsxwriter not installed")
+    def test_xlsxwriter_backend_writes_nulls_as_blank(self):
+        self._assert_null_row_blank(self._export("xlsxwriter"))
+
+
+if __name__ == "__main__":
+    unittest.main()